@@ -1,77 +1,410 @@
+import time
+from datetime import datetime
+from typing import Optional
+
 import lightning as L
+from fastapi.responses import PlainTextResponse
+from lightning.app.api import Get
 from lightning.app.structures import List
 
+from lightning_deepchecks.conditions import BLOCKING_SEVERITIES, is_blocking
+from lightning_deepchecks.metrics import collect, to_prometheus
 from lightning_deepchecks.scheduled_dag.components import (
+    WORKER_SUITES,
     DataIntegrityCheck,
     GetDataWork,
     ModelEvaluation,
+    SuiteWorker,
     TrainTestValidation,
 )
 
+OVERLAP_POLICIES = ("skip", "queue", "coalesce")
+
 
 class DeepchecksDAG(L.LightningFlow):
-    """This flow is a DAG with Deepchecks components."""
+    """This flow is a DAG with Deepchecks components.
+
+    With ``skip_evaluation_on`` set to ``"warn"`` or ``"fail"``, the model evaluation waits for the data integrity
+    check and is skipped when its conditions reach that severity. ``blocking_checks`` stop the train test validation
+    suite at the first of them failing at ``blocking_severity``. Skipped stages are recorded in ``skipped_stages``.
+    ``integrity_chunk_rows`` streams the data integrity check in chunks, best paired with the ``"arrow"`` handoff.
 
-    def __init__(self, **dag_kwargs):
+    With ``warm_worker=True``, the three suites are sent as jobs to a single resident ``SuiteWorker`` instead of their
+    own works, so the imports, models and processes are reused from one run to the next.
+
+    ``sampling`` options make every suite check the same seeded, stratified sample of the data, sized from a time
+    budget with the throughput measured on the previous run, or from a memory budget.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_cache_size: int = 2 * 1024**3,
+        parallel: bool = False,
+        handoff: str = "payload",
+        stop_works: bool = True,
+        incremental_drift: bool = False,
+        check_workers: Optional[int] = 1,
+        history_path: Optional[str] = None,
+        skip_evaluation_on: Optional[str] = None,
+        blocking_checks: Optional[list] = None,
+        blocking_severity: str = "fail",
+        integrity_chunk_rows: Optional[int] = None,
+        warm_worker: bool = False,
+        sampling: Optional[dict] = None,
+    ):
         super().__init__()
+        if skip_evaluation_on is not None and skip_evaluation_on not in BLOCKING_SEVERITIES:
+            raise ValueError(f"{skip_evaluation_on} is not supported. Supported severities are {BLOCKING_SEVERITIES}")
+        if warm_worker and (parallel or incremental_drift or integrity_chunk_rows):
+            raise ValueError(
+                "warm_worker=True runs the suites one after the other in full,"
+                " it can't be combined with parallel, incremental_drift or integrity_chunk_rows."
+            )
         # Step 1: Create a work to get the data.
-        self.data_collector = GetDataWork()
+        self.data_collector = GetDataWork(handoff=handoff, sampling=sampling)
 
         # Step 2: Create a work for data integrity check
-        self.data_integrity_check = DataIntegrityCheck()
+        self.data_integrity_check = DataIntegrityCheck(
+            cache_dir=cache_dir,
+            max_cache_size=max_cache_size,
+            parallel=parallel,
+            check_workers=check_workers,
+            history_path=history_path,
+            chunk_rows=integrity_chunk_rows,
+        )
 
         # Step 3: Create a work for train test validation suite
-        self.train_test_validation = TrainTestValidation()
+        self.train_test_validation = TrainTestValidation(
+            cache_dir=cache_dir,
+            max_cache_size=max_cache_size,
+            parallel=parallel,
+            check_workers=check_workers,
+            incremental=incremental_drift,
+            history_path=history_path,
+            blocking_checks=blocking_checks,
+            blocking_severity=blocking_severity,
+        )
 
         # Step 4: Create a work for model evaluation
-        self.model_evaluation = ModelEvaluation()
+        self.model_evaluation = ModelEvaluation(
+            cache_dir=cache_dir,
+            max_cache_size=max_cache_size,
+            parallel=parallel,
+            check_workers=check_workers,
+            history_path=history_path,
+        )
+
+        # Step 2 to 4 as jobs of a single warm work.
+        self.suite_worker = (
+            SuiteWorker(
+                cache_dir=cache_dir,
+                max_cache_size=max_cache_size,
+                check_workers=check_workers,
+                history_path=history_path,
+            )
+            if warm_worker
+            else None
+        )
+        self.blocking_checks = blocking_checks
+        self.blocking_severity = blocking_severity
+
+        self.parallel = parallel
+        # Works are kept running between runs when the DAG is reused by the ``ScheduledDAG`` pool.
+        self.stop_works = stop_works
+        self.skip_evaluation_on = skip_evaluation_on
+        self.dispatched_job = None
+        self.run_id = None
+        self.started_at = None
+        self.failed_suites = []
+        self.skipped_stages = {}
+        # Names of the works called by the current run, the other ones still hold the state of an older run.
+        self.started_works = []
+        self.stage_metrics = {}
+        self.rows_per_second = None
+        self.has_completed = False
 
+    def reset(self, run_id: str):
+        """Prepares the DAG and its works for a new run."""
+        # Measured once per run from the previous one, the data collection is only called again when its arguments
+        # change. Runs served by the result cache say nothing of the throughput, the last measure is kept.
+        self.rows_per_second = self._rows_per_second() or self.rows_per_second
+        self.run_id = run_id
+        self.started_at = time.time()
+        self.failed_suites = []
+        self.skipped_stages = {}
+        self.started_works = []
         self.has_completed = False
 
+    def _rows_per_second(self) -> Optional[float]:
+        """Returns the rows checked per second by the suites of the previous run, or None when any of them reused
+        cached results."""
+        sampling = self.data_collector.sampling
+        if self.suite_worker is not None:
+            # The worker metrics only hold its last job, every job of the run reports its own duration and hits.
+            records = [self.suite_worker.results.get(self._job_id(suite)) for suite in WORKER_SUITES]
+            records = [record for record in records if record is not None]
+        else:
+            records = [record for record in self.stage_metrics.values() if record["stage"] in WORKER_SUITES]
+        if not sampling or not records or any(record.get("cache_hits", 0) > 0 for record in records):
+            return None
+        rows = sampling["train"]["sample_rows"] + sampling["test"]["sample_rows"]
+        durations = [record["duration_s"] for record in records]
+        # The warm worker runs its jobs one after the other.
+        duration = max(durations) if self.parallel and self.suite_worker is None else sum(durations)
+        return rows / duration if duration > 0 else None
+
+    def summary(self) -> dict:
+        """Returns a compact record of the last run, kept by the ``ScheduledDAG`` once the run has completed."""
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "finished_at": time.time(),
+            "status": "failed" if self.failed_suites else "succeeded",
+            "failed_suites": list(self.failed_suites),
+            "skipped_stages": dict(self.skipped_stages),
+            "stopped_at": self._stopped_at(),
+            "sampling": self.data_collector.sampling,
+            "durations": {record["stage"]: record["duration_s"] for record in self.stage_metrics.values()},
+            "reports": self._reports(),
+        }
+
+    def _reports(self) -> dict:
+        """Returns the report paths of the current run, None for the stages which were skipped or failed."""
+        if self.suite_worker is not None:
+            jobs = [self.suite_worker.results.get(self._job_id(suite), {}) for suite in WORKER_SUITES]
+            return {name: path for job in jobs for name, path in job.get("reports", {}).items()}
+        reports = {
+            "train_integrity": (self.data_integrity_check, "train_results_path"),
+            "test_integrity": (self.data_integrity_check, "test_results_path"),
+            "train_test_validation": (self.train_test_validation, "train_test_validation_results_path"),
+            "model_evaluation": (self.model_evaluation, "evaluation_results_path"),
+        }
+        ran = [work.name for work in self._ran_works()]
+        return {
+            name: str(getattr(work, attribute)) if work.name in ran and getattr(work, attribute) else None
+            for name, (work, attribute) in reports.items()
+        }
+
+    def _ran_works(self) -> list:
+        # A work's status is the one of its last call, made with the ``run_id`` of the current run. Works are only
+        # stopped once their call has succeeded.
+        return [
+            work
+            for work in self.works()
+            if work.name in self.started_works and (work.has_succeeded or work.has_stopped)
+        ]
+
+    def _start(self, work, **kwargs):
+        if work.name not in self.started_works:
+            self.started_works = [*self.started_works, work.name]
+        work.run(run_id=self.run_id, **kwargs)
+
+    def _run_suite(self, work):
+        self._start(work, df_train=self.data_collector.df_train, df_test=self.data_collector.df_test)
+
     def run(self):
+        self._run_steps()
+        # Only the works which ran in this run, the others would report the timings of an older one.
+        self.stage_metrics = collect(self._ran_works())
+
+    def _run_steps(self):
         # Step 1: Download and load data.
-        self.data_collector.run()
+        self._start(self.data_collector, rows_per_second=self.rows_per_second)
+
+        if self.suite_worker is not None:
+            self._run_suite_jobs()
+            return
+
+        if self.parallel:
+            self._run_suites_in_parallel()
+            return
 
         # Step 2: Do data integrity check.
-        self.data_integrity_check.run(
-            df_train=self.data_collector.df_train,
-            df_test=self.data_collector.df_test,
-        )
-        self.data_integrity_check.stop()
+        self._run_suite(self.data_integrity_check)
+        if self.stop_works:
+            self.data_integrity_check.stop()
 
         # Step 3: Run the train test validation suite
-        self.train_test_validation.run(
-            df_train=self.data_collector.df_train,
-            df_test=self.data_collector.df_test,
-        )
-        self.train_test_validation.stop()
+        self._run_suite(self.train_test_validation)
+        if self.stop_works:
+            self.train_test_validation.stop()
 
-        # Step 4: Start model evaluation
-        self.model_evaluation.run(
-            df_train=self.data_collector.df_train,
-            df_test=self.data_collector.df_test,
-        )
+        # Step 4: Start model evaluation, unless the data integrity conditions ruled the data out.
+        if self._evaluation_skipped(self.data_integrity_check.condition_status):
+            self.has_completed = True
+            return
+        self._run_suite(self.model_evaluation)
         if self.model_evaluation.evaluation_results_path:
             self.has_completed = True
 
+    def _job_id(self, suite: str) -> str:
+        return f"{self.run_id}-{suite}"
+
+    def _stopped_at(self) -> Optional[str]:
+        if self.suite_worker is not None:
+            return self.suite_worker.results.get(self._job_id("train_test_validation"), {}).get("stopped_at")
+        return self.train_test_validation.stopped_at
+
+    def _run_suite_jobs(self):
+        # The jobs are sent one at a time, the next one once the worker has reported the previous one.
+        if self.data_collector.df_train is None:
+            return
+        options = {"blocking_checks": self.blocking_checks, "blocking_severity": self.blocking_severity}
+        for index, suite in enumerate(WORKER_SUITES):
+            result = self.suite_worker.results.get(self._job_id(suite))
+            if result is not None:
+                continue
+            if self.dispatched_job == self._job_id(suite) and self.suite_worker.has_failed:
+                # The worker process died without reporting the job, the jobs left are failed with it.
+                jobs = {name: self.suite_worker.results.get(self._job_id(name), {}) for name in WORKER_SUITES[:index]}
+                failed = [name for name, job in jobs.items() if job.get("status") == "failed"]
+                self.failed_suites = [*failed, *WORKER_SUITES[index:]]
+                self.has_completed = True
+                return
+            if suite == "model_evaluation":
+                integrity = self.suite_worker.results[self._job_id("data_integrity")]
+                if self._evaluation_skipped(integrity.get("condition_status")):
+                    break
+            self.dispatched_job = self._job_id(suite)
+            self._start(
+                self.suite_worker,
+                job_id=self._job_id(suite),
+                suite=suite,
+                df_train=self.data_collector.df_train,
+                df_test=self.data_collector.df_test,
+                options=options,
+            )
+            return
+
+        jobs = {suite: self.suite_worker.results.get(self._job_id(suite), {}) for suite in WORKER_SUITES}
+        self.failed_suites = [suite for suite, job in jobs.items() if job.get("status") == "failed"]
+        self.has_completed = True
+
+    def _evaluation_skipped(self, status: Optional[str]) -> bool:
+        if self.skip_evaluation_on is None or status is None or not is_blocking(status, self.skip_evaluation_on):
+            return False
+        self.skipped_stages = {"model_evaluation": f"the data integrity conditions ended with {status}"}
+        return True
+
+    def _run_suites_in_parallel(self):
+        # Steps 2 to 4 only depend on the collected data, so they all start as soon as it is available.
+        suite_works = [self.data_integrity_check, self.train_test_validation]
+        for work in suite_works:
+            self._run_suite(work)
+
+        evaluate = True
+        if self.skip_evaluation_on is not None and not self.data_integrity_check.has_failed:
+            if not self.data_integrity_check.has_succeeded:
+                # The model evaluation waits for the data integrity conditions.
+                return
+            evaluate = not self._evaluation_skipped(self.data_integrity_check.condition_status)
+        if evaluate:
+            self._run_suite(self.model_evaluation)
+            suite_works.append(self.model_evaluation)
+
+        if all(work.has_succeeded or work.has_failed for work in suite_works):
+            self.failed_suites = [work.name for work in suite_works if work.has_failed]
+            if self.stop_works:
+                for work in suite_works:
+                    work.stop()
+            self.has_completed = True
+
 
 class ScheduledDAG(L.LightningFlow):
-    def __init__(self, dag_cls, **dag_kwargs):
+    """Launches a DAG run on every tick of ``cron`` using a fixed pool of at most ``max_concurrent_runs`` DAGs.
+
+    When every DAG of the pool is still busy on a tick, ``overlap_policy`` decides what happens to the new run:
+    ``"skip"`` drops it, ``"queue"`` keeps up to ``max_queued_runs`` of them and ``"coalesce"`` only keeps the latest.
+    Completed runs are compacted into the ``history`` summaries, bounded by ``max_history``. The pooled DAGs are built
+    with ``stop_works=False``, their works are reused from one run to the next.
+    """
+
+    def __init__(
+        self,
+        dag_cls,
+        cron: str = "0 * * * *",
+        max_concurrent_runs: int = 1,
+        overlap_policy: str = "coalesce",
+        max_queued_runs: int = 24,
+        max_history: int = 24 * 7,
+        **dag_kwargs,
+    ):
         super().__init__()
+        if overlap_policy not in OVERLAP_POLICIES:
+            raise ValueError(f"{overlap_policy} is not supported. Supported overlap policies are {OVERLAP_POLICIES}")
+        if dag_kwargs.get("stop_works"):
+            raise ValueError("stop_works=True is not supported, the pooled DAGs run their works again on every run")
+        # The pool reuses the works of a DAG from one run to the next, they must stay up in between.
+        dag_kwargs = {**dag_kwargs, "stop_works": False}
         self.dags = List()
         self._dag_cls = dag_cls
         self.dag_kwargs = dag_kwargs
+        self.cron = cron
+        self.max_concurrent_runs = max_concurrent_runs
+        self.overlap_policy = overlap_policy
+        self.max_queued_runs = max_queued_runs
+        self.max_history = max_history
+        self.pending_runs = []
+        self.history = []
 
     def run(self):
         """Example of scheduling an infinite number of DAG runs continuously."""
-        # Step 1: Every hour, create and launch a new DAG.
-        if self.schedule("0 * * * *"):
-            print("Launching a new DAG")
+        # Step 1: Every hour, submit a new DAG run.
+        if self.schedule(self.cron):
+            self._submit(datetime.now().strftime("%Y-%m-%d_%H-%M-%S"))
+
+        # Step 2: Hand the pending runs to idle DAGs, growing the pool up to its limit.
+        for dag in self.dags:
+            if dag.run_id is None and self.pending_runs:
+                self._launch(dag, self.pending_runs.pop(0))
+        while self.pending_runs and len(self.dags) < self.max_concurrent_runs:
             self.dags.append(self._dag_cls(**self.dag_kwargs))
+            self._launch(self.dags[-1], self.pending_runs.pop(0))
 
+        # Step 3: Progress the running DAGs and release the completed ones.
         for dag in self.dags:
-            if not dag.has_completed:
-                dag.run()
+            if dag.run_id is None:
+                continue
+            dag.run()
+            if dag.has_completed:
+                self._record(dag.summary())
+                dag.run_id = None
+
+    def _submit(self, run_id: str):
+        busy = all(dag.run_id is not None for dag in self.dags) and len(self.dags) >= self.max_concurrent_runs
+        if not busy:
+            self.pending_runs.append(run_id)
+        elif self.overlap_policy == "skip":
+            print(f"Skipping the DAG run {run_id}, the previous runs have not finished.")
+            self._record({"run_id": run_id, "status": "skipped"})
+        elif self.overlap_policy == "coalesce":
+            # Only the most recent data matters, the new run replaces any run still waiting.
+            for skipped_run_id in self.pending_runs:
+                self._record({"run_id": skipped_run_id, "status": "coalesced"})
+            self.pending_runs = [run_id]
+        elif len(self.pending_runs) < self.max_queued_runs:
+            self.pending_runs.append(run_id)
+        else:
+            print(f"Dropping the DAG run {run_id}, {self.max_queued_runs} runs are already queued.")
+            self._record({"run_id": run_id, "status": "dropped"})
+
+    def configure_api(self):
+        return [Get("/metrics", self.metrics_handler)]
+
+    def metrics_handler(self):
+        """Exposes the last run of every stage of the pool in the Prometheus text format."""
+        records = {}
+        for dag in self.dags:
+            records.update(dag.stage_metrics)
+        return PlainTextResponse(to_prometheus(records), media_type="text/plain; version=0.0.4")
+
+    def _launch(self, dag, run_id: str):
+        print(f"Launching the DAG run {run_id}")
+        dag.reset(run_id)
+
+    def _record(self, summary: dict):
+        self.history = [*self.history, summary][-self.max_history :]
 
 
-app = L.LightningApp(ScheduledDAG(DeepchecksDAG))
+app = L.LightningApp(ScheduledDAG(DeepchecksDAG, parallel=True, handoff="arrow"))
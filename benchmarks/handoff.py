@@ -0,0 +1,62 @@
+"""Compares the Payload (pickle) handoff with the Arrow IPC handoff between GetDataWork and the suite works.
+
+Usage: python benchmarks/handoff.py --datasets adult lending_club --consumers 3
+"""
+import argparse
+import os
+import pickle
+import tempfile
+import time
+
+from deepchecks.tabular.datasets.classification import adult, lending_club
+
+from lightning_deepchecks.handoff import read_frame, write_frame
+
+DATASETS = {"adult": adult, "lending_club": lending_club}
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def compare(name: str, consumers: int, tmp_dir: str) -> dict:
+    df_train, _ = DATASETS[name].load_data(data_format="Dataframe")
+
+    # A Payload is pickled once by the producer and unpickled again by every consumer.
+    payload, pickle_time = _timed(pickle.dumps, df_train)
+    unpickle_time = sum(_timed(pickle.loads, payload)[1] for _ in range(consumers))
+
+    path = os.path.join(tmp_dir, f"{name}.arrow")
+    _, write_time = _timed(write_frame, df_train, path)
+    read_time = sum(_timed(read_frame, path)[1] for _ in range(consumers))
+
+    return {
+        "dataset": name,
+        "rows": len(df_train),
+        "payload_bytes": len(payload) * consumers,
+        "payload_seconds": pickle_time + unpickle_time,
+        "arrow_bytes": os.path.getsize(path),
+        "arrow_seconds": write_time + read_time,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--datasets", nargs="+", default=list(DATASETS), choices=list(DATASETS))
+    parser.add_argument("--consumers", type=int, default=3, help="Number of suite works reading the data.")
+    args = parser.parse_args()
+
+    print(f"{'dataset':<14}{'rows':>10}{'payload MB':>14}{'payload s':>12}{'arrow MB':>12}{'arrow s':>10}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in args.datasets:
+            row = compare(name, args.consumers, tmp_dir)
+            print(
+                f"{row['dataset']:<14}{row['rows']:>10}{row['payload_bytes'] / 1e6:>14.1f}"
+                f"{row['payload_seconds']:>12.2f}{row['arrow_bytes'] / 1e6:>12.1f}{row['arrow_seconds']:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
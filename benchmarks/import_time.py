@@ -0,0 +1,66 @@
+"""Measures the cold import time of the app modules, optionally against another git revision.
+
+Every import runs in a fresh interpreter, the median of ``--repeats`` runs is reported.
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --baseline HEAD~1
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+MODULES = (
+    "lightning_deepchecks.scheduled_dag.components",
+    "lightning_deepchecks.demo.components",
+    "lightning_deepchecks.registry",
+)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SNIPPET = "import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+
+
+def import_time(module: str, source_dir: str, repeats: int) -> float:
+    env = {**os.environ, "PYTHONPATH": source_dir}
+    timings = []
+    for _ in range(repeats):
+        output = subprocess.check_output(
+            [sys.executable, "-c", _SNIPPET.format(module=module)], env=env, cwd=source_dir, text=True
+        )
+        timings.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def export_revision(revision: str, target_dir: str):
+    archive = subprocess.check_output(["git", "archive", revision], cwd=ROOT)
+    subprocess.run(["tar", "-x", "-C", target_dir], input=archive, check=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=list(MODULES))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--baseline", help="A git revision to compare the working tree with.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as baseline_dir:
+        if args.baseline:
+            export_revision(args.baseline, baseline_dir)
+
+        print(f"{'module':<50}{'baseline s':>12}{'current s':>12}")
+        for module in args.modules:
+            current = import_time(module, ROOT, args.repeats)
+            baseline = float("nan")
+            if args.baseline:
+                try:
+                    baseline = import_time(module, baseline_dir, args.repeats)
+                except subprocess.CalledProcessError:
+                    # The module doesn't exist at the baseline revision.
+                    pass
+            print(f"{module:<50}{baseline:>12.3f}{current:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
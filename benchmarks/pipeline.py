@@ -0,0 +1,238 @@
+"""Benchmarks the DeepchecksDAG stages in-process, without the Lightning runtime and without network access.
+
+Every stage runs in a fresh process on synthetic datasets of several sizes and on the small datasets bundled with
+scikit-learn. The stages call the helpers of the scheduled DAG works: the ``GetDataWork`` handoff, the cached suite
+runs and ``save_report``. Their ``RunMetrics`` records, with the payload bytes, are appended as JSON lines to
+``--output``.
+
+Usage:
+    python benchmarks/pipeline.py --rows 10000 100000 1000000 --cat-columns 2 10 --output results.jsonl
+    python benchmarks/pipeline.py --compare baseline.jsonl results.jsonl
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import pickle
+import platform
+import subprocess
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from lightning_deepchecks.artifacts import COMPRESSIONS
+from lightning_deepchecks.handoff import HANDOFF_MODES, hand_off, read_dataset
+
+STAGES = ("get_data", "data_integrity", "train_test_validation", "model_evaluation")
+BUNDLED_DATASETS = ("iris", "breast_cancer", "wine")
+LABEL = "target"
+# The benchmark model is fitted on at most this many rows, fitting is not what is measured.
+MAX_FIT_ROWS = 50_000
+
+
+def make_synthetic(rows: int, cat_columns: int, num_columns: int = 10, seed: int = 0):
+    """Returns train and test frames with a binary label, ``cat_columns`` categorical and ``num_columns`` numeric
+    features, the test frame being slightly drifted."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for shift, n_rows in ((0.0, rows), (0.2, max(rows // 4, 1))):
+        data = {f"num_{i}": rng.normal(shift, 1.0, n_rows) for i in range(num_columns)}
+        for i in range(cat_columns):
+            data[f"cat_{i}"] = rng.choice([f"v{j}" for j in range(5 + i)], n_rows)
+        score = data["num_0"] + (rng.random(n_rows) - 0.5) if num_columns else rng.random(n_rows) - 0.5
+        data[LABEL] = (score > shift).astype(int)
+        frames.append(pd.DataFrame(data))
+    return frames[0], frames[1], [f"cat_{i}" for i in range(cat_columns)]
+
+
+def load_bundled(name: str, seed: int = 0):
+    """Returns train and test frames of a dataset shipped with scikit-learn."""
+    from sklearn import datasets
+    from sklearn.model_selection import train_test_split
+
+    df = getattr(datasets, f"load_{name}")(as_frame=True).frame
+    df_train, df_test = train_test_split(df, test_size=0.3, random_state=seed)
+    return df_train, df_test, []
+
+
+def fit_model(df_train, cat_features):
+    from sklearn.compose import ColumnTransformer
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OrdinalEncoder
+
+    features = df_train.drop(columns=[LABEL])
+    encoder = ColumnTransformer(
+        [("cat", OrdinalEncoder(handle_unknown="use_encoded_value", unknown_value=-1), cat_features)],
+        remainder="passthrough",
+    )
+    model = Pipeline([("encoder", encoder), ("model", HistGradientBoostingClassifier(max_iter=50))])
+    sample = min(len(features), MAX_FIT_ROWS)
+    return model.fit(features.iloc[:sample], df_train[LABEL].iloc[:sample])
+
+
+def _load_handoff(path: str) -> list:
+    from lightning.app.storage import Payload
+
+    # Payloads travel pickled, as they do between works, Arrow handoffs as the path of their file.
+    with open(path, "rb") as f:
+        return [data if isinstance(data, str) else Payload(data) for data in pickle.load(f)]
+
+
+def _run_stage(stage: str, work_dir: str, cat_features: list, handoff: str, compression: str, queue):
+    """Runs one stage with the helpers of the scheduled DAG works, and puts its ``RunMetrics`` record in ``queue``."""
+    from lightning.app.storage import Payload
+
+    from lightning_deepchecks.artifacts import save_report
+    from lightning_deepchecks.cache import ResultCache
+    from lightning_deepchecks.metrics import RunMetrics
+    from lightning_deepchecks.scheduled_dag.components import _run_cached_suites
+
+    # The handoff files are written relative to the working directory, as in a work.
+    os.chdir(work_dir)
+    payload_bytes, reports = 0, []
+
+    if stage == "get_data":
+        with open("frames.pkl", "rb") as f:
+            df_train, df_test = pickle.load(f)
+        metrics = RunMetrics(stage)
+        with metrics.phase("handoff"):
+            handoffs = hand_off(df_train, df_test, handoff, "get_data", LABEL, cat_features)[:2]
+            outputs = [data.value if isinstance(data, Payload) else str(data) for data in handoffs]
+            with open("handoff.pkl", "wb") as f:
+                pickle.dump(outputs, f)
+        files = ["handoff.pkl", *(outputs if handoff == "arrow" else [])]
+        payload_bytes = sum(os.path.getsize(path) for path in files)
+    else:
+        df_train, df_test = _load_handoff("handoff.pkl")
+        metrics = RunMetrics(stage, df_train, df_test)
+        # A cache of its own per stage, the benchmark measures the suites rather than the cache.
+        cache = ResultCache(os.path.join(work_dir, f"cache_{stage}"))
+        model = None
+        with metrics.phase("load"):
+            df_train = read_dataset(df_train, LABEL, cat_features)
+            df_test = read_dataset(df_test, LABEL, cat_features)
+            if stage == "model_evaluation":
+                with open("model.pkl", "rb") as f:
+                    model = pickle.load(f)
+        if stage == "data_integrity":
+            jobs = [(f"{stage}_train.html", [df_train]), (f"{stage}_test.html", [df_test])]
+        else:
+            jobs = [(f"{stage}.html", [df_train, df_test])]
+        _run_cached_suites(cache, stage, jobs, metrics, model=model)
+        with metrics.phase("save_report"):
+            reports = [save_report(report_path, compression=compression) for report_path, _ in jobs]
+
+    record = metrics.finish(sum(report["size"] for report in reports))
+    record["payload_bytes"] = payload_bytes
+    record["compressed_report_bytes"] = sum(report["compressed_size"] for report in reports)
+    queue.put(record)
+
+
+def run_benchmark(
+    name: str,
+    df_train,
+    df_test,
+    cat_features: list,
+    stages,
+    output: str,
+    metadata: dict,
+    handoff: str = "arrow",
+    compression: str = "gzip",
+):
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as work_dir:
+        with open(os.path.join(work_dir, "frames.pkl"), "wb") as f:
+            pickle.dump((df_train, df_test), f)
+        if "model_evaluation" in stages:
+            with open(os.path.join(work_dir, "model.pkl"), "wb") as f:
+                pickle.dump(fit_model(df_train, cat_features), f)
+
+        # The suites read what the data collection handed off, so it always runs first.
+        for stage in ["get_data", *[stage for stage in stages if stage != "get_data"]]:
+            # A fresh process per stage, so the peak RSS of a stage isn't hidden by the previous ones.
+            queue = context.Queue()
+            process = context.Process(
+                target=_run_stage, args=(stage, work_dir, cat_features, handoff, compression, queue)
+            )
+            process.start()
+            process.join()
+            if process.exitcode != 0:
+                raise RuntimeError(f"The {stage} stage failed on {name} with exit code {process.exitcode}.")
+            metrics = queue.get()
+            if stage not in stages:
+                continue
+
+            record = {
+                **metadata,
+                "dataset": name,
+                "rows": len(df_train) + len(df_test),
+                "cat_columns": len(cat_features),
+                "handoff": handoff,
+                **metrics,
+            }
+            print(json.dumps(record))
+            with open(output, "a") as f:
+                f.write(json.dumps(record) + "\n")
+
+
+def compare(baseline: str, candidate: str):
+    """Prints the ratio of every metric between two result files, matched on dataset, rows and stage."""
+
+    def _load(path):
+        with open(path) as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        return {(r["dataset"], r["rows"], r["cat_columns"], r["stage"]): r for r in records}
+
+    baseline_records, candidate_records = _load(baseline), _load(candidate)
+    print(f"{'dataset':<24}{'rows':>10}{'stage':>24}{'time x':>10}{'peak rss x':>12}{'report x':>10}")
+    for key in sorted(set(baseline_records) & set(candidate_records)):
+        old, new = baseline_records[key], candidate_records[key]
+        ratios = [
+            new[metric] / old[metric] if old[metric] else float("nan")
+            for metric in ("duration_s", "peak_rss_bytes", "report_bytes")
+        ]
+        print(f"{key[0]:<24}{key[1]:>10}{key[3]:>24}{ratios[0]:>10.2f}{ratios[1]:>12.2f}{ratios[2]:>10.2f}")
+
+
+def _metadata() -> dict:
+    import deepchecks
+
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit, "deepchecks": deepchecks.__version__, "python": platform.python_version()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", nargs="+", type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--cat-columns", nargs="+", type=int, default=[2, 10])
+    parser.add_argument("--bundled", nargs="*", default=list(BUNDLED_DATASETS), choices=BUNDLED_DATASETS)
+    parser.add_argument("--stages", nargs="+", default=list(STAGES), choices=STAGES)
+    parser.add_argument("--handoff", default="arrow", choices=HANDOFF_MODES)
+    parser.add_argument("--compression", default="gzip", choices=list(COMPRESSIONS))
+    parser.add_argument("--output", default="benchmark_results.jsonl")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CANDIDATE"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    metadata = _metadata()
+    options = (args.handoff, args.compression)
+    for name in args.bundled:
+        df_train, df_test, cat_features = load_bundled(name)
+        run_benchmark(name, df_train, df_test, cat_features, args.stages, args.output, metadata, *options)
+    for rows in args.rows:
+        for cat_columns in args.cat_columns:
+            df_train, df_test, cat_features = make_synthetic(rows, cat_columns)
+            name = f"synthetic_{cat_columns}cat"
+            run_benchmark(name, df_train, df_test, cat_features, args.stages, args.output, metadata, *options)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,90 +1,228 @@
+import time
+import uuid
+from typing import Optional
+
 import lightning as L
 import streamlit as st
 import streamlit.components.v1 as components
+from fastapi.responses import PlainTextResponse
+from lightning.app.api import Get
 from lightning.app.frontend.stream_lit import StreamlitFrontend
 from lightning.app.structures import List
 
-from lightning_deepchecks.demo.components import DataIntegrityCheck, GetDataWork, ModelEvaluation, TrainTestValidation
+from lightning_deepchecks.artifacts import load_report
+from lightning_deepchecks.demo.flows import SUITES, DeepchecksSuites
+from lightning_deepchecks.metrics import collect, to_prometheus
+from lightning_deepchecks.registry import datasets, find_algo
+from lightning_deepchecks.viewer import parse_suite_json, render_check, summary_rows
 
 DOMAINS = ["Tabular", "Vision"]
-SUITES = ["Data Integrity", "Train Test Validation", "Model Evaluation"]
-
-DATASETS = {
-    "Tabular": {
-        "classification": [
-            "iris",
-            "breast_cancer",
-            "phishing",
-            "adult",
-            "lending_club",
-        ],
-        "regression": ["avocado", "wine_quality"],
-    },
-    "Vision": {
-        "classification": ["mnist"],
-        "detection": ["coco"],
-    },
-}
-
-
-class DeepchecksSuites(L.LightningFlow):
-    def __init__(self):
-        super().__init__()
-        self.data_collector = GetDataWork()
-        self.data_integrity_check = DataIntegrityCheck()
-        self.train_test_validation = TrainTestValidation()
-        self.model_evaluation = ModelEvaluation()
-        self.suites = List()
-
-    def run(self, config: dict):
-        self.data_collector.run(config)
-
-        for suite in config["suites"]:
-            if suite not in SUITES:
-                raise ValueError(f"{suite} is not supported. Supported suites are {SUITES}")
-            if suite == "Data Integrity":
-                self.data_integrity_check.run(self.data_collector.df_train, self.data_collector.df_test, config)
-            elif suite == "Train Test Validation":
-                self.train_test_validation.run(self.data_collector.df_train, self.data_collector.df_test, config)
-            elif suite == "Model Evaluation":
-                self.model_evaluation.run(self.data_collector.df_train, self.data_collector.df_test, config)
+VIEWERS = ["Summary", "Full report"]
+# Number of checks listed per page of the summary viewer.
+CHECKS_PER_PAGE = 10
+
+
+def _config_key(config: dict) -> str:
+    return f"{config['domain']}/{config['algo']}/{config['dataset']}/{','.join(sorted(config['suites']))}"
 
 
 class DeepchecksFlow(L.LightningFlow):
-    def __init__(self):
+    """Runs the jobs submitted by every UI session on a pool of at most ``max_concurrent_jobs`` ``DeepchecksSuites``.
+
+    A job with the same configuration as a queued or running job is coalesced into it, and both sessions get the
+    same reports. Completed jobs are kept up to ``max_history``. With ``sampling`` options, the runs check a stratified
+    sample of the tabular data, whose parameters are recorded in the run.
+    """
+
+    def __init__(
+        self,
+        parallel: bool = False,
+        handoff: str = "payload",
+        check_workers: Optional[int] = 1,
+        vision_loader: Optional[dict] = None,
+        shared_assets: bool = False,
+        sampling: Optional[dict] = None,
+        max_concurrent_jobs: int = 1,
+        max_history: int = 100,
+    ):
         super().__init__()
-        self.deepchecks_config = None
-        self.deepchecks_suites = DeepchecksSuites()
-        self.processed = False
+        self.runners = List()
+        self.runner_kwargs = {
+            "parallel": parallel,
+            "handoff": handoff,
+            "check_workers": check_workers,
+            "vision_loader": vision_loader,
+            "shared_assets": shared_assets,
+            "sampling": sampling,
+        }
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.max_history = max_history
+        # Written by the UI sessions: job id to ``{"session", "config", "submitted_at"}``.
+        self.submissions = {}
+        # Job id to its session and its run, coalesced jobs share the same run.
+        self.jobs = {}
+        # Run id to its config, status, jobs and, once completed, its reports.
+        self.runs = {}
+        self.pending_runs = []
+        self.stage_metrics = {}
 
     def run(self):
-        if self.deepchecks_config is not None:
-            self.deepchecks_suites.run(
-                config=self.deepchecks_config,
-            )
-            self.deepchecks_config = None
-            self.processed = True
+        # Step 1: Accept the jobs submitted since the last loop.
+        submissions, self.submissions = self.submissions, {}
+        for job_id, submission in submissions.items():
+            if job_id not in self.jobs:
+                self._submit(job_id, submission)
+
+        # Step 2: Hand the pending runs to idle runners, growing the pool up to its limit.
+        for runner in self.runners:
+            if runner.run_id is None and self.pending_runs:
+                self._launch(runner, self.pending_runs.pop(0))
+        while self.pending_runs and len(self.runners) < self.max_concurrent_jobs:
+            self.runners.append(DeepchecksSuites(**self.runner_kwargs))
+            self._launch(self.runners[-1], self.pending_runs.pop(0))
+
+        # Step 3: Progress the running jobs and release the runners of the completed ones.
+        for runner in self.runners:
+            if runner.run_id is None:
+                continue
+            config = self.runs[runner.run_id]["config"]
+            runner.run(config)
+            if runner.has_completed:
+                self._update_run(
+                    runner.run_id,
+                    status="failed" if runner.failed_suites else "succeeded",
+                    finished_at=time.time(),
+                    sampling=runner.data_collector.sampling,
+                    reports=runner.reports(config["suites"]),
+                )
+                runner.run_id = None
+                self._compact()
+        self.stage_metrics = collect(self.works())
+
+    def _submit(self, job_id: str, submission: dict):
+        key = _config_key(submission["config"])
+        run_id = next(
+            (
+                run_id
+                for run_id, run in self.runs.items()
+                if run["key"] == key and run["status"] in ("queued", "running")
+            ),
+            None,
+        )
+        if run_id is None:
+            run_id = job_id
+            self.runs = {
+                **self.runs,
+                run_id: {
+                    "key": key,
+                    "config": submission["config"],
+                    "status": "queued",
+                    "jobs": [],
+                    "submitted_at": submission["submitted_at"],
+                },
+            }
+            self.pending_runs = [*self.pending_runs, run_id]
+        else:
+            print(f"Coalescing the job {job_id} into the run {run_id}.")
+        self._update_run(run_id, jobs=[*self.runs[run_id]["jobs"], job_id])
+        self.jobs = {**self.jobs, job_id: {"session": submission["session"], "run": run_id}}
+
+    def _launch(self, runner: DeepchecksSuites, run_id: str):
+        print(f"Launching the run {run_id}")
+        runner.reset(run_id)
+        self._update_run(run_id, status="running", started_at=time.time())
+
+    def _update_run(self, run_id: str, **fields):
+        self.runs = {**self.runs, run_id: {**self.runs[run_id], **fields}}
+
+    def _compact(self):
+        completed = [run_id for run_id, run in self.runs.items() if run["status"] in ("succeeded", "failed")]
+        expired = set(completed[: max(len(completed) - self.max_history, 0)])
+        if expired:
+            self.runs = {run_id: run for run_id, run in self.runs.items() if run_id not in expired}
+            self.jobs = {job_id: job for job_id, job in self.jobs.items() if job["run"] not in expired}
 
     def configure_layout(self):
         return StreamlitFrontend(render_fn=render_deepchecks_flow)
 
+    def configure_api(self):
+        return [Get("/metrics", self.metrics_handler)]
+
+    def metrics_handler(self):
+        """Exposes the last run of every stage in the Prometheus text format."""
+        return PlainTextResponse(to_prometheus(self.stage_metrics), media_type="text/plain; version=0.0.4")
 
-# def get_datasets(domain: str):
-#     if domain not in DOMAINS:
-#         raise ValueError(f"{domain} is not supported. Supported domains are {DOMAINS}")
 
-#     DATASETS_MODULE = f"deepchecks.{domain.lower()}.datasets"
-#     ALGOS = eval(f"{DATASETS_MODULE}.__all__")
+@st.experimental_memo(max_entries=8, show_spinner=False)
+def _load_asset(asset: dict) -> str:
+    return load_report(asset)
 
-#     DATASETS = {}
-#     for algo in ALGOS:
-#         DATASETS[algo] = eval(f"{DATASETS_MODULE}.{algo}.__all__")
 
-#     ## TODO: add support for YOLO Dataset as well
-#     if domain == "Vision":
-#         DATASETS["detection"] = ["coco"]
+@st.experimental_memo(max_entries=8, show_spinner=False)
+def _load_report(report: dict) -> str:
+    # The shared scripts, such as plotly.js, are only fetched for the first report using them.
+    return load_report(report, load_asset=_load_asset)
 
-#     return DATASETS
+
+@st.experimental_memo(max_entries=8, show_spinner=False)
+def _load_suite(report_json: dict) -> dict:
+    return parse_suite_json(load_report(report_json))
+
+
+def _render_suite_summary(report_json: dict):
+    suite = _load_suite(report_json)
+    st.table(summary_rows(suite))
+
+    pages = max((len(suite["checks"]) - 1) // CHECKS_PER_PAGE + 1, 1)
+    page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1) if pages > 1 else 1
+    checks = suite["checks"][(page - 1) * CHECKS_PER_PAGE : page * CHECKS_PER_PAGE]
+
+    # Rendered checks are kept for the session, a rerun only sends the checks being looked at.
+    if "report_fragments" not in st.session_state:
+        st.session_state.report_fragments = {}
+    fragments = st.session_state.report_fragments
+    for check in checks:
+        key = (report_json["sha256"], check["index"])
+        if st.checkbox(f"{check['header']} ({check['status']})", key=f"{key[0]}-{key[1]}"):
+            if key not in fragments:
+                fragments[key] = render_check(check)
+            components.html(fragments[key], height=600, scrolling=True)
+
+
+def _render_stage_metrics(stage_metrics: dict):
+    rows = [
+        {
+            "stage": record["stage"],
+            "duration (s)": record["duration_s"],
+            "cpu (s)": record["cpu_s"],
+            "peak rss (MB)": round(record["peak_rss_bytes"] / 2**20, 1),
+            "input (MB)": round(record["input_bytes"] / 2**20, 1),
+            "report (MB)": round(record["report_bytes"] / 2**20, 1),
+            "cache hits/misses": f"{record['cache_hits']}/{record['cache_misses']}",
+            "phases (s)": ", ".join(f"{name}: {duration:.2f}" for name, duration in record["phases"].items()),
+        }
+        for record in stage_metrics.values()
+    ]
+    with st.expander("Stage timings"):
+        st.table(rows)
+
+
+def _session_jobs(state, job_ids: list) -> list:
+    """Returns the status of the jobs submitted by the current session, the queued ones with their position."""
+    jobs = []
+    for job_id in job_ids:
+        job = state.jobs.get(job_id)
+        if job is None:
+            if job_id in state.submissions:
+                jobs.append({"job": job_id, "status": "submitted", "queue position": None, "run": None})
+            continue
+        run = state.runs.get(job["run"])
+        if run is None:
+            # Compacted out of the history.
+            continue
+        position = state.pending_runs.index(job["run"]) + 1 if job["run"] in state.pending_runs else None
+        jobs.append({"job": job_id, "status": run["status"], "queue position": position, "run": run})
+    return jobs
 
 
 def render_deepchecks_flow(state):
@@ -96,39 +234,67 @@ def render_deepchecks_flow(state):
 
     domain = st.sidebar.selectbox("Select a domain", DOMAINS, index=0)
 
-    datasets = [dataset for dataset_list in DATASETS[domain].values() for dataset in dataset_list]
+    domain_datasets = [dataset for dataset_list in datasets(domain.lower()).values() for dataset in dataset_list]
 
-    dataset = st.sidebar.selectbox("Select a dataset", datasets)
+    dataset = st.sidebar.selectbox("Select a dataset", domain_datasets)
     suites = st.sidebar.multiselect("Select suites", SUITES, default=SUITES)
 
     run = st.sidebar.button("Run", disabled=not bool(suites))
 
+    # Every browser session only sees the jobs it submitted.
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+        st.session_state.job_ids = []
+
     if run:
-        algo = None
-        for dc_algo, datasets in DATASETS[domain].items():
-            if dataset in datasets:
-                algo = dc_algo
-                break
-        state.deepchecks_config = {
+        job_id = uuid.uuid4().hex[:12]
+        config = {
             "domain": domain.lower(),
-            "algo": algo,
+            "algo": find_algo(domain.lower(), dataset),
             "dataset": dataset,
             "suites": suites,
         }
-        state.processed = False
+        state.submissions = {
+            **state.submissions,
+            job_id: {"session": st.session_state.session_id, "config": config, "submitted_at": time.time()},
+        }
+        st.session_state.job_ids = [*st.session_state.job_ids, job_id]
+
+    if state.stage_metrics:
+        _render_stage_metrics(state.stage_metrics)
+
+    jobs = _session_jobs(state, st.session_state.job_ids)
+    if not jobs:
+        return
+    st.table(
+        [
+            {
+                "job": job["job"],
+                "dataset": job["run"]["config"]["dataset"] if job["run"] else "",
+                "suites": ", ".join(job["run"]["config"]["suites"]) if job["run"] else "",
+                "status": job["status"],
+                "queue position": job["queue position"] or "",
+            }
+            for job in jobs
+        ]
+    )
 
-    selected_suite = st.selectbox("View Suite Results For", suites)
+    job_ids = [job["job"] for job in jobs]
+    selected_job = jobs[job_ids.index(st.selectbox("View Results For Job", job_ids, index=len(job_ids) - 1))]
+    if selected_job["status"] not in ("succeeded", "failed"):
+        return
 
-    display_results = None
+    selected_suite = st.selectbox("View Suite Results For", selected_job["run"]["config"]["suites"])
+    viewer = st.radio("Viewer", VIEWERS)
 
-    if selected_suite == "Data Integrity" and state.deepchecks_suites.data_integrity_check.processed:
-        display_results = state.deepchecks_suites.data_integrity_check.train_results_path
-    elif selected_suite == "Train Test Validation" and state.deepchecks_suites.train_test_validation.processed:
-        display_results = state.deepchecks_suites.train_test_validation.results_path
-    elif selected_suite == "Model Evaluation" and state.deepchecks_suites.model_evaluation.processed:
-        display_results = state.deepchecks_suites.model_evaluation.results_path
+    reports = selected_job["run"]["reports"].get(selected_suite, {})
+    report, report_json = reports.get("report"), reports.get("report_json")
 
-    if display_results is not None:
+    if viewer == "Summary" and report_json is not None:
+        _render_suite_summary(report_json)
+    elif report is not None:
+        # Only the selected report is fetched and decompressed, once per artifact.
+        display_results = _load_report(report)
         TEMPLATE_WRAPPER = """
         <div style="height:{height}px;overflow-y:auto;position:relative;">
             {body}
@@ -142,4 +308,4 @@ def render_deepchecks_flow(state):
         )
 
 
-app = L.LightningApp(DeepchecksFlow())
+app = L.LightningApp(DeepchecksFlow(parallel=True, handoff="arrow", shared_assets=True))
@@ -0,0 +1,157 @@
+import gzip
+import hashlib
+import os
+import re
+import tempfile
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from lightning.app.storage import Drive
+
+COMPRESSIONS = {"gzip": ".gz", "brotli": ".br"}
+# Inline scripts at least this large, such as the plotly.js bundle, are moved to shared assets.
+MIN_ASSET_SIZE = 32 * 1024
+
+_SCRIPT = re.compile(r"<script(?P<attrs>[^>]*)>(?P<body>.*?)</script>", re.DOTALL | re.IGNORECASE)
+_ASSET_SCRIPT = re.compile(r'<script(?P<attrs>[^>]*) data-asset="(?P<name>[0-9a-f]+\.js)"></script>')
+
+
+def _compress(data: bytes, compression: str) -> bytes:
+    if compression == "brotli":
+        import brotli
+
+        return brotli.compress(data)
+    # No timestamp in the header, so the same content always compresses to the same bytes.
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def _decompress(data: bytes, compression: str) -> bytes:
+    if compression == "brotli":
+        import brotli
+
+        return brotli.decompress(data)
+    return gzip.decompress(data)
+
+
+def extract_assets(text: str) -> Tuple[str, Dict[str, str]]:
+    """Returns ``text`` with its large inline scripts replaced by placeholders, and the scripts by asset name.
+
+    Assets are named after the hash of their content, so the same plotly.js bundle always gets the same name.
+    """
+    assets = {}
+
+    def replace(match) -> str:
+        body = match.group("body")
+        if len(body) < MIN_ASSET_SIZE:
+            return match.group(0)
+        name = hashlib.sha256(body.encode()).hexdigest()[:16] + ".js"
+        assets[name] = body
+        return f'<script{match.group("attrs")} data-asset="{name}"></script>'
+
+    return _SCRIPT.sub(replace, text), assets
+
+
+def _save_asset(name: str, body: str, assets_dir: str, drive: Optional[Drive], compression: str) -> dict:
+    path = os.path.join(assets_dir, name + COMPRESSIONS[compression])
+    if not os.path.exists(path):
+        # Only the first report using an asset writes it, the next ones reference it. Works running in parallel may
+        # write the same asset at once, each one stages it in a file of its own before moving it in place.
+        os.makedirs(assets_dir, exist_ok=True)
+        fd, staging_path = tempfile.mkstemp(prefix=f".{name}-", dir=assets_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_compress(body.encode(), compression))
+            os.replace(staging_path, path)
+        finally:
+            if os.path.exists(staging_path):
+                os.remove(staging_path)
+        if drive is not None:
+            drive.put(path)
+    return {
+        "path": path,
+        "drive": drive.id if drive is not None else None,
+        "component_name": drive.component_name if drive is not None else None,
+        "compression": compression,
+    }
+
+
+def save_report(
+    report_path: str,
+    drive: Optional[Drive] = None,
+    compression: str = "gzip",
+    shared_assets: bool = False,
+) -> dict:
+    """Replaces the HTML report at ``report_path`` with a compressed artifact and returns its descriptor.
+
+    The descriptor is small enough to live in the work state, the report itself is only read when displayed. With
+    ``shared_assets=True``, the large scripts embedded in the report are stored once in an ``assets`` directory next
+    to it, shared by all the reports, and the artifact only keeps the report's own content.
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"{compression} is not supported. Supported compressions are {list(COMPRESSIONS)}")
+
+    with open(report_path, "rb") as f:
+        data = f.read()
+    assets = {}
+    if shared_assets:
+        text, bodies = extract_assets(data.decode("utf-8"))
+        assets_dir = os.path.join(os.path.dirname(report_path), "assets")
+        assets = {name: _save_asset(name, body, assets_dir, drive, compression) for name, body in bodies.items()}
+        data = text.encode("utf-8")
+    artifact_path = report_path + COMPRESSIONS[compression]
+    with open(artifact_path + ".tmp", "wb") as f:
+        f.write(_compress(data, compression))
+    os.replace(artifact_path + ".tmp", artifact_path)
+    os.remove(report_path)
+
+    if drive is not None:
+        drive.put(artifact_path)
+
+    return {
+        "path": artifact_path,
+        "drive": drive.id if drive is not None else None,
+        "component_name": drive.component_name if drive is not None else None,
+        "compression": compression,
+        "size": len(data),
+        "compressed_size": os.path.getsize(artifact_path),
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "created_at": time.time(),
+        "assets": assets,
+    }
+
+
+def save_result_json(result, report_path: str, drive: Optional[Drive] = None, compression: str = "gzip") -> dict:
+    """Saves the per-check structure of a ``SuiteResult`` next to its HTML report, as a compressed JSON artifact.
+
+    The viewer reads it to list the checks and only renders the ones being looked at.
+    """
+    json_path = os.path.splitext(report_path)[0] + ".json"
+    with open(json_path, "w") as f:
+        f.write(result.to_json(with_display=True))
+    return save_report(json_path, drive, compression)
+
+
+def load_report(descriptor: dict, load_asset: Optional[Callable[[dict], str]] = None) -> str:
+    """Returns the HTML report described by ``descriptor``, fetching it from its drive when not available
+    locally.
+
+    The shared assets of the report are inlined back with ``load_asset``, which callers can memoize to fetch every
+    asset only once.
+    """
+    path = descriptor["path"]
+    if not os.path.exists(path) and descriptor["drive"] is not None:
+        drive = Drive(descriptor["drive"], component_name="deepchecks_ui")
+        drive.get(path, component_name=descriptor["component_name"], overwrite=True)
+
+    with open(path, "rb") as f:
+        text = _decompress(f.read(), descriptor["compression"]).decode("utf-8")
+
+    assets = descriptor.get("assets")
+    if not assets:
+        return text
+    load_asset = load_asset or load_report
+
+    def inline(match) -> str:
+        return f'<script{match.group("attrs")}>{load_asset(assets[match.group("name")])}</script>'
+
+    return _ASSET_SCRIPT.sub(inline, text)
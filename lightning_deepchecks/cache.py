@@ -0,0 +1,196 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from typing import Any, Callable, Optional, Tuple
+
+DEFAULT_CACHE_DIR = os.getenv(
+    "LIGHTNING_DEEPCHECKS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "lightning_deepchecks")
+)
+
+
+def _to_bytes(obj: Any) -> bytes:
+    import pandas as pd
+
+    if isinstance(obj, pd.DataFrame):
+        # Hashing the values row by row is much cheaper than pickling the whole frame.
+        header = repr([(str(name), str(dtype)) for name, dtype in obj.dtypes.items()]).encode()
+        return header + pd.util.hash_pandas_object(obj, index=True).values.tobytes()
+    if isinstance(obj, bytes):
+        return obj
+    if isinstance(obj, str):
+        return obj.encode()
+    return pickle.dumps(obj)
+
+
+def fingerprint(*objs: Any) -> str:
+    """Returns a stable hex digest of the given DataFrames, models and plain values."""
+    digest = hashlib.sha256()
+    for obj in objs:
+        data = _to_bytes(obj)
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def _file_checksum(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _entry_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+class DiskCache:
+    """A directory of cache entries, evicted least recently used first once it grows over ``max_size`` bytes."""
+
+    def __init__(self, cache_dir: str, max_size: int):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the directory of the entry stored under ``key`` or None on a miss."""
+        path = os.path.join(self.cache_dir, key)
+        if not os.path.isdir(path):
+            self.misses += 1
+            return None
+        self.hits += 1
+        # Touch the entry so that it is the last one to be evicted.
+        os.utime(path)
+        return path
+
+    def put(self, key: str, write_fn: Callable[[str], None]) -> str:
+        """Creates the entry ``key`` by calling ``write_fn`` with a staging directory which is then atomically
+        moved in place."""
+        path = os.path.join(self.cache_dir, key)
+        staging_dir = tempfile.mkdtemp(prefix=f".{key}-", dir=self.cache_dir)
+        try:
+            write_fn(staging_dir)
+            os.replace(staging_dir, path)
+        except OSError:
+            # Another process stored the same entry in the meantime, keep theirs.
+            if not os.path.isdir(path):
+                raise
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        self.evict()
+        return path
+
+    def evict(self):
+        entries = [
+            os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if not name.startswith(".")
+        ]
+        entries = sorted(entries, key=os.path.getmtime)
+        sizes = {entry: _entry_size(entry) for entry in entries}
+        total_size = sum(sizes.values())
+        while entries and total_size > self.max_size:
+            entry = entries.pop(0)
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= sizes[entry]
+
+
+class ResultCache(DiskCache):
+    """Caches suite results and their HTML reports, keyed by a fingerprint of the suite inputs."""
+
+    RESULT_FILE = "result.pkl"
+    REPORT_FILE = "report.html"
+
+    def __init__(self, cache_dir: Optional[str] = None, max_size: int = 2 * 1024**3):
+        super().__init__(cache_dir or os.path.join(DEFAULT_CACHE_DIR, "results"), max_size)
+
+    def key(self, suite_name: str, *inputs: Any) -> str:
+        import deepchecks
+
+        return fingerprint(suite_name, deepchecks.__version__, *inputs)
+
+    def load(self, key: str) -> Optional[Tuple[Any, str]]:
+        """Returns the cached ``SuiteResult`` and the path of its HTML report or None on a miss or a corrupted entry."""
+        path = self.get(key)
+        if path is None:
+            return None
+        report_path = os.path.join(path, self.REPORT_FILE)
+        try:
+            with open(os.path.join(path, self.RESULT_FILE), "rb") as f:
+                result = pickle.load(f)
+            if not os.path.isfile(report_path):
+                raise FileNotFoundError(f"Missing report for the cached result {key}.")
+        except (OSError, EOFError, pickle.UnpicklingError) as e:
+            print(f"Discarding the cached result {key}: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        return result, report_path
+
+    def save(self, key: str, result: Any, report_path: str) -> str:
+        def _write(staging_dir: str):
+            with open(os.path.join(staging_dir, self.RESULT_FILE), "wb") as f:
+                pickle.dump(result, f)
+            shutil.copyfile(report_path, os.path.join(staging_dir, self.REPORT_FILE))
+
+        return self.put(key, _write)
+
+
+class DatasetCache(DiskCache):
+    """Keeps downloaded train/test DataFrames on local disk as Arrow files, verified against their checksums."""
+
+    MANIFEST_FILE = "manifest.json"
+    SPLITS = ("train", "test")
+
+    def __init__(self, cache_dir: Optional[str] = None, max_size: int = 5 * 1024**3):
+        super().__init__(cache_dir or os.path.join(DEFAULT_CACHE_DIR, "datasets"), max_size)
+
+    def key(self, domain: str, algo: str, dataset: str) -> str:
+        import deepchecks
+
+        return f"{domain}-{algo}-{dataset}-{deepchecks.__version__}"
+
+    def load(self, key: str) -> Optional[Tuple[Any, Any]]:
+        """Returns the cached train and test DataFrames or None on a miss or a corrupted entry."""
+        from lightning_deepchecks.handoff import read_frame
+
+        path = self.get(key)
+        if path is None:
+            return None
+        try:
+            with open(os.path.join(path, self.MANIFEST_FILE)) as f:
+                manifest = json.load(f)
+            split_paths = [os.path.join(path, f"{split}.arrow") for split in self.SPLITS]
+            if any(_file_checksum(p) != manifest[split] for p, split in zip(split_paths, self.SPLITS)):
+                raise ValueError(f"Checksum mismatch for the cached dataset {key}.")
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Discarding the cached dataset {key}: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        return tuple(read_frame(p) for p in split_paths)
+
+    def save(self, key: str, df_train, df_test) -> str:
+        from lightning_deepchecks.handoff import write_frame
+
+        def _write(staging_dir: str):
+            manifest = {}
+            for split, df in zip(self.SPLITS, (df_train, df_test)):
+                split_path = os.path.join(staging_dir, f"{split}.arrow")
+                write_frame(df, split_path)
+                manifest[split] = _file_checksum(split_path)
+            with open(os.path.join(staging_dir, self.MANIFEST_FILE), "w") as f:
+                json.dump(manifest, f)
+
+        return self.put(key, _write)
+
+    def fetch(self, key: str, load_fn: Callable[[], Tuple[Any, Any]]) -> Tuple[Any, Any]:
+        """Returns the cached train and test DataFrames, calling ``load_fn`` to download them on a miss."""
+        cached = self.load(key)
+        if cached is not None:
+            print(f"Loaded {key} from the local dataset cache.")
+            return cached
+        df_train, df_test = load_fn()
+        self.save(key, df_train, df_test)
+        return df_train, df_test
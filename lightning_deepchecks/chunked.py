@@ -0,0 +1,315 @@
+import hashlib
+import html
+import os
+import re
+import tempfile
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Union
+
+from lightning_deepchecks.conditions import SEVERITIES
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Strings that deepchecks reads as null values, after stripping and lowercasing.
+STRING_NULLS = ("", "null", "nan", "none", "na", "n/a", "?", "\x00")
+# Columns with more distinct values are no longer tracked by the string and categorical estimators.
+MAX_DISTINCT_VALUES = 10_000
+# The row hashes are spilled to this many files on disk, the duplicates are counted one file at a time.
+HASH_PARTITIONS = 64
+
+_NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+
+
+def iter_batches(source, chunk_rows: int = 100_000) -> Iterator:
+    """Yields the rows of ``source`` as DataFrames of at most ``chunk_rows`` rows.
+
+    ``source`` is a DataFrame, a ``Payload`` of one, or the path of a Parquet, CSV or Arrow IPC file. Only one chunk of
+    a file is held in memory at a time.
+    """
+    from lightning.app.storage import Payload
+
+    if isinstance(source, Payload):
+        source = source.value
+    source = getattr(source, "data", source)
+    if hasattr(source, "iloc"):
+        for start in range(0, len(source), chunk_rows):
+            yield source.iloc[start : start + chunk_rows]
+        return
+
+    path = str(source)
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    elif path.endswith((".csv", ".csv.gz")):
+        import pandas as pd
+
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+    else:
+        import pyarrow as pa
+
+        # The handoff files are memory-mapped, slicing them only pages in the rows of the chunk.
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        for start in range(0, table.num_rows, chunk_rows):
+            yield table.slice(start, chunk_rows).to_pandas()
+
+
+def _base_form(value: str) -> str:
+    return _NON_ALPHANUMERIC.sub("", value.lower())
+
+
+class IntegrityStats:
+    """Data integrity statistics of a dataset, aggregated chunk by chunk.
+
+    Nulls, data types, string variants and categorical contingency tables are counted exactly. Duplicates and
+    conflicting labels are found from the 64-bit hashes of the features and of the label of every row. These 16 bytes
+    per row are spilled to ``HASH_PARTITIONS`` files in ``spill_dir``, partitioned on the feature hash. Counting them at
+    the end loads one partition at a time, so the memory needed grows with the rows, but only by about 16 /
+    ``HASH_PARTITIONS`` bytes per row, plus the sort of a partition. Feature label correlations use streaming moments:
+    the correlation ratio for numeric features against a categorical label, Cramer's V for categorical features against
+    it, and the squared Pearson correlation against a numeric label. They stand in for the predictive power score of
+    deepchecks, on the same 0 to 1 scale.
+    """
+
+    def __init__(self, label: str, cat_features: List[str], spill_dir: Optional[str] = None):
+        self.label = label
+        self.cat_features = cat_features
+        self.rows = 0
+        self.chunks = 0
+        self.categorical_label = None
+        self.nulls: Dict[str, Dict[str, int]] = {}
+        self.types: Dict[str, Dict[str, int]] = {}
+        self.variants: Dict[str, Dict[str, set]] = {}
+        self.moments: Dict[str, Dict[str, "np.ndarray"]] = {}
+        self.pearson: Dict[str, "np.ndarray"] = {}
+        self.contingency: Dict[str, Dict[tuple, int]] = {}
+        self._spill_dir = tempfile.TemporaryDirectory(prefix="integrity-hashes-", dir=spill_dir)
+        self._duplicate_counts = None
+        self._digest = hashlib.sha256()
+
+    def update(self, df):
+        import pandas as pd
+
+        if self.categorical_label is None and self.label in df.columns:
+            self.categorical_label = self.label in self.cat_features or df[self.label].dtype.kind not in "iufb"
+        self.rows += len(df)
+        self.chunks += 1
+
+        self._spill_hashes(df)
+
+        for name in df.columns:
+            column = df[name]
+            self._update_nulls(name, column)
+            if column.dtype.kind == "O" or isinstance(column.dtype, pd.CategoricalDtype):
+                self._update_types(name, column)
+                self._update_variants(name, column)
+            if name != self.label and self.label in df.columns:
+                self._update_correlation(name, column, df[self.label])
+
+    def _spill_hashes(self, df):
+        import numpy as np
+        import pandas as pd
+
+        # Full-row duplicates are duplicate pairs of feature and label hashes, no separate row hash is needed.
+        pairs = np.zeros(len(df), dtype=[("features", "<u8"), ("label", "<u8")])
+        features = df.drop(columns=[self.label]) if self.label in df.columns else df
+        pairs["features"] = pd.util.hash_pandas_object(features, index=False).to_numpy()
+        if self.label in df.columns:
+            pairs["label"] = pd.util.hash_pandas_object(df[self.label], index=False).to_numpy()
+        self._digest.update(pairs.tobytes())
+
+        partitions = pairs["features"] % HASH_PARTITIONS
+        for partition in np.unique(partitions):
+            with open(os.path.join(self._spill_dir.name, f"{partition}.bin"), "ab") as f:
+                pairs[partitions == partition].tofile(f)
+
+    def _update_nulls(self, name: str, column):
+        counts = self.nulls.setdefault(name, {})
+        missing = int(column.isna().sum())
+        if missing:
+            counts["NaN"] = counts.get("NaN", 0) + missing
+        if column.dtype.kind == "O":
+            strings = column[column.map(lambda value: isinstance(value, str))].str.strip().str.lower()
+            for value, count in strings[strings.isin(STRING_NULLS)].value_counts().items():
+                key = repr(value)
+                counts[key] = counts.get(key, 0) + int(count)
+
+    def _update_types(self, name: str, column):
+        import pandas as pd
+
+        values = column.dropna().astype(str)
+        numbers = int(pd.to_numeric(values, errors="coerce").notna().sum())
+        counts = self.types.setdefault(name, {"numbers": 0, "strings": 0})
+        counts["numbers"] += numbers
+        counts["strings"] += len(values) - numbers
+
+    def _update_variants(self, name: str, column):
+        variants = self.variants.setdefault(name, {})
+        if variants is None:
+            return
+        for value in column.dropna().astype(str).unique():
+            variants.setdefault(_base_form(value), set()).add(value)
+        if len(variants) > MAX_DISTINCT_VALUES:
+            self.variants[name] = None
+
+    def _update_correlation(self, name: str, column, label):
+        import numpy as np
+        import pandas as pd
+
+        categorical = name in self.cat_features or column.dtype.kind not in "iufb"
+        valid = column.notna() & label.notna()
+        column, label = column[valid], label[valid]
+        if categorical and self.categorical_label:
+            table = self.contingency.setdefault(name, {})
+            if table is None:
+                return
+            for key, count in pd.crosstab(column.astype(str), label.astype(str)).stack().items():
+                table[key] = table.get(key, 0) + int(count)
+            if len(table) > MAX_DISTINCT_VALUES:
+                self.contingency[name] = None
+            return
+        if categorical or self.categorical_label:
+            # The correlation ratio of the numeric side, grouped by the categorical side.
+            groups, values = (label.astype(str), column) if self.categorical_label else (column.astype(str), label)
+            values = values.astype(float)
+            grouped = pd.DataFrame({"n": 1.0, "sum": values, "sumsq": values**2}).groupby(groups.to_numpy()).sum()
+            moments = self.moments.setdefault(name, {})
+            for group, row in grouped.iterrows():
+                moments[group] = moments.get(group, 0) + row.to_numpy()
+            return
+        x, y = column.astype(float).to_numpy(), label.astype(float).to_numpy()
+        sums = np.array([len(x), x.sum(), y.sum(), (x * x).sum(), (y * y).sum(), (x * y).sum()])
+        self.pearson[name] = self.pearson.get(name, 0) + sums
+
+    def _correlations(self) -> Dict[str, float]:
+        import numpy as np
+
+        scores = {}
+        for name, (n, sx, sy, sxx, syy, sxy) in self.pearson.items():
+            var_x, var_y = n * sxx - sx**2, n * syy - sy**2
+            scores[name] = float((n * sxy - sx * sy) ** 2 / (var_x * var_y)) if var_x > 0 and var_y > 0 else 0.0
+        for name, moments in self.moments.items():
+            n, total, total_sq = np.sum(list(moments.values()), axis=0)
+            between = sum(group_sum**2 / count for count, group_sum, _ in moments.values()) - total**2 / n
+            total_var = total_sq - total**2 / n
+            scores[name] = float(between / total_var) if total_var > 0 else 0.0
+        for name, table in self.contingency.items():
+            if table is not None:
+                scores[name] = _cramers_v(table)
+        return scores
+
+    def _duplicates(self) -> Dict[str, int]:
+        import numpy as np
+
+        if self._duplicate_counts is not None:
+            return self._duplicate_counts
+        duplicates, conflicting = 0, 0
+        # Equal features share a partition, each partition is counted on its own.
+        for name in os.listdir(self._spill_dir.name):
+            pairs = np.fromfile(os.path.join(self._spill_dir.name, name), dtype=[("features", "<u8"), ("label", "<u8")])
+            unique_pairs = np.unique(pairs)
+            duplicates += len(pairs) - len(unique_pairs)
+            # Feature rows seen with more than one label.
+            _, label_counts = np.unique(unique_pairs["features"], return_counts=True)
+            conflicting += int((label_counts > 1).sum())
+        self._spill_dir.cleanup()
+        self._duplicate_counts = {"duplicates": duplicates, "conflicting_samples": conflicting}
+        return self._duplicate_counts
+
+    @property
+    def fingerprint(self) -> str:
+        return self._digest.hexdigest()
+
+    def checks(self) -> Dict[str, dict]:
+        """Returns the status and the metrics of every check, by the headers of the data integrity suite."""
+        rows = max(self.rows, 1)
+        nulls = {name: counts for name, counts in self.nulls.items() if counts}
+        null_ratios = {name: sum(counts.values()) / rows for name, counts in nulls.items()}
+        types = {
+            name: {kind: count / max(sum(counts.values()), 1) for kind, count in counts.items()}
+            for name, counts in self.types.items()
+            if counts["numbers"] and counts["strings"]
+        }
+        variants = {
+            name: {base: len(values) for base, values in forms.items() if len(values) > 1}
+            for name, forms in self.variants.items()
+            if forms is not None
+        }
+        variants = {name: counts for name, counts in variants.items() if counts}
+        duplicates = self._duplicates()
+        correlations = self._correlations()
+
+        # The same defaults as the conditions of the data integrity suite.
+        return {
+            "Mixed Nulls": {
+                "status": "fail" if any(len(counts) > 1 for counts in nulls.values()) else "pass",
+                "metrics": {f"{name}.ratio": ratio for name, ratio in null_ratios.items()},
+            },
+            "Mixed Data Types": {
+                "status": "fail" if any(0.01 < min(ratios.values()) < 0.1 for ratios in types.values()) else "pass",
+                "metrics": _flatten(types),
+            },
+            "String Mismatch": {
+                "status": "warn" if variants else "pass",
+                "metrics": _flatten(variants),
+            },
+            "Data Duplicates": {
+                "status": "fail" if duplicates["duplicates"] / rows > 0.05 else "pass",
+                "metrics": {"duplicates": duplicates["duplicates"], "ratio": duplicates["duplicates"] / rows},
+            },
+            "Conflicting Labels": {
+                "status": "fail" if duplicates["conflicting_samples"] else "pass",
+                "metrics": {"conflicting_samples": duplicates["conflicting_samples"]},
+            },
+            "Feature Label Correlation": {
+                "status": "fail" if any(score >= 0.8 for score in correlations.values()) else "pass",
+                "metrics": correlations,
+            },
+        }
+
+    def status(self, checks: Optional[Dict[str, dict]] = None) -> str:
+        """Returns the most severe status of the checks."""
+        return max((check["status"] for check in (checks or self.checks()).values()), key=SEVERITIES.get)
+
+    def save_as_html(self, path: str, checks: Optional[Dict[str, dict]] = None, title: str = "Data Integrity"):
+        """Writes the checks as an HTML report, one table of metrics per check."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"<h1>{html.escape(title)}</h1><p>{self.rows} rows read in {self.chunks} chunks.</p>")
+            for header, check in (checks or self.checks()).items():
+                f.write(f"<h2>{html.escape(header)}</h2><p>Status: {check['status']}</p><table>")
+                for metric, value in check["metrics"].items():
+                    f.write(f"<tr><td>{html.escape(str(metric))}</td><td>{value:.4f}</td></tr>")
+                f.write("</table>")
+
+
+def _flatten(values: Dict[str, dict]) -> Dict[str, float]:
+    return {f"{name}.{key}": value for name, items in values.items() for key, value in items.items()}
+
+
+def _cramers_v(table: Dict[tuple, int]) -> float:
+    import numpy as np
+    import pandas as pd
+
+    counts = pd.Series(table).unstack(fill_value=0).to_numpy(dtype=float)
+    total = counts.sum()
+    if total == 0 or min(counts.shape) < 2:
+        return 0.0
+    expected = counts.sum(axis=1, keepdims=True) * counts.sum(axis=0, keepdims=True) / total
+    chi2 = float(np.sum((counts - expected) ** 2 / expected))
+    return float(np.sqrt(chi2 / (total * (min(counts.shape) - 1))))
+
+
+def chunked_integrity(
+    source: Union[str, object],
+    label: str,
+    cat_features: List[str],
+    chunk_rows: int = 100_000,
+    spill_dir: Optional[str] = None,
+) -> IntegrityStats:
+    """Streams ``source`` in chunks of ``chunk_rows`` rows and returns its aggregated integrity statistics."""
+    stats = IntegrityStats(label, cat_features, spill_dir)
+    for chunk in iter_batches(source, chunk_rows):
+        stats.update(chunk)
+    return stats
@@ -0,0 +1,80 @@
+from typing import Any, List, Optional, Sequence
+
+# A check that errored says nothing about the data, it never blocks the next stages.
+SEVERITIES = {"no_conditions": 0, "error": 0, "pass": 0, "warn": 1, "fail": 2}
+BLOCKING_SEVERITIES = ("warn", "fail")
+
+
+def check_status(check_result) -> str:
+    """Returns the most severe of ``"fail"``, ``"warn"``, ``"error"`` and ``"pass"`` among the conditions of a check
+    result, ``"no_conditions"`` without conditions and ``"error"`` when the check itself failed."""
+    if not hasattr(check_result, "value"):
+        return "error"
+    conditions = getattr(check_result, "conditions_results", None)
+    if not conditions:
+        return "no_conditions"
+    categories = {condition.category.name.lower() for condition in conditions}
+    return next((status for status in ("fail", "warn", "error") if status in categories), "pass")
+
+
+def worst_status(results: Sequence) -> str:
+    """Returns the most severe check status of the given ``SuiteResult``."""
+    statuses = [check_status(check_result) for result in results for check_result in result.results]
+    return max(statuses, key=SEVERITIES.get, default="no_conditions")
+
+
+def is_blocking(status: str, severity: str) -> bool:
+    if severity not in BLOCKING_SEVERITIES:
+        raise ValueError(f"{severity} is not supported. Supported severities are {BLOCKING_SEVERITIES}")
+    return SEVERITIES[status] >= SEVERITIES[severity]
+
+
+def _is_blocking_check(check, blocking_checks: List[str]) -> bool:
+    names = {type(check).__name__}
+    if hasattr(check, "name"):
+        names.add(check.name())
+    return bool(names & set(blocking_checks))
+
+
+def stopping_check(result, blocking_checks: List[str], severity: str = "fail") -> Optional[str]:
+    """Returns the header of the first blocking check of a ``SuiteResult`` whose conditions reach ``severity``."""
+    for check_result in result.results:
+        check = getattr(check_result, "check", None)
+        if check is not None and _is_blocking_check(check, blocking_checks):
+            if is_blocking(check_status(check_result), severity):
+                return check_result.get_header()
+    return None
+
+
+def run_fail_fast(
+    suite,
+    args: Sequence,
+    blocking_checks: List[str],
+    severity: str = "fail",
+    max_workers: Optional[int] = 1,
+    **kwargs: Any,
+):
+    """Runs the ``blocking_checks`` of ``suite`` one by one, then the others, stopping at the first blocking check
+    whose conditions reach ``severity``.
+
+    Checks are matched on their class name or their display name. Returns the ``SuiteResult`` of the checks that ran,
+    the blocking ones first.
+    """
+    from deepchecks.core.suite import SuiteResult
+
+    from lightning_deepchecks.parallel import run_suites
+
+    blocking = [check for check in suite.checks.values() if _is_blocking_check(check, blocking_checks)]
+    others = [check for check in suite.checks.values() if check not in blocking]
+
+    results = []
+    for check in blocking:
+        (result,) = run_suites([(type(suite)(suite.name, check), args)], max_workers=1, **kwargs)
+        results.extend(result.results)
+        if stopping_check(result, blocking_checks, severity) is not None:
+            return SuiteResult(suite.name, results)
+
+    if others:
+        (result,) = run_suites([(type(suite)(suite.name, *others), args)], max_workers=max_workers, **kwargs)
+        results.extend(result.results)
+    return SuiteResult(suite.name, results)
@@ -1,12 +1,22 @@
 import importlib
 import os
+import pickle
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional, Union
 
 import lightning as L
-from deepchecks.tabular import Dataset
 from lightning.app import BuildConfig
-from lightning.app.storage import Payload
+from lightning.app.storage import Drive, Path, Payload
+
+from lightning_deepchecks.artifacts import save_report, save_result_json
+from lightning_deepchecks.cache import DatasetCache, fingerprint
+from lightning_deepchecks.handoff import HANDOFF_MODES, hand_off, read_dataset
+from lightning_deepchecks.metrics import RunMetrics
+from lightning_deepchecks.parallel import run_suites
+from lightning_deepchecks.registry import get_dataset, load_module
+from lightning_deepchecks.sampling import sample_frame, sampling_options
+from lightning_deepchecks.vision import load_vision_data, vision_reference
 
 
 @dataclass
@@ -20,154 +30,349 @@ class CustomBuildConfig(BuildConfig):
 
 
 class GetDataWork(L.LightningWork):
-    """This component is responsible to download some data and store them with a PayLoad."""
-
-    def __init__(self):
+    """This component is responsible to download some data and store them with a PayLoad.
+
+    With ``sampling`` options, tabular data is first reduced to a seeded sample stratified on the label and the
+    categorical features, sized to fit a time or a memory budget. Its parameters are recorded in ``sampling``.
+    """
+
+    def __init__(
+        self,
+        handoff: str = "payload",
+        dataset_cache_dir: Optional[str] = None,
+        max_dataset_cache_size: int = 5 * 1024**3,
+        vision_loader: Optional[dict] = None,
+        sampling: Optional[dict] = None,
+    ):
         cloud_build_config = CustomBuildConfig()
 
         super().__init__(cloud_build_config=cloud_build_config)
+        if handoff not in HANDOFF_MODES:
+            raise ValueError(f"{handoff} is not supported. Supported handoff modes are {HANDOFF_MODES}")
+        self.handoff = handoff
+        self.dataset_cache_dir = dataset_cache_dir
+        self.max_dataset_cache_size = max_dataset_cache_size
+        # Options of the vision data loaders: ``batch_size``, ``num_workers``, ``n_samples`` and ``pin_memory``. The
+        # suites fail on an option changed from its default that the dataset does not support.
+        self.vision_loader = vision_loader or {}
+        self.sampling_options = sampling_options(sampling) if sampling is not None else None
         self.df_train = None
         self.df_test = None
+        self.memory_usage = None
+        self.sampling = None
+        self.metrics = None
 
-    def run(self, config: dict):
+    def run(self, config: dict, run_id: Optional[str] = None):
+        # ``run_id`` only makes every job a new call, so a reused work collects the data again.
         print(f"Starting {config['dataset']} data collection...")
+        metrics = RunMetrics("get_data")
+        self.sampling = None
         if config["domain"] == "vision":
-            df_train = eval(
-                f"deepchecks.{config['domain']}.datasets.{config['algo']}.{config['dataset']}"
-                f".load_dataset(train=True, object_type='VisionData')"
-            )
-            df_test = eval(
-                f"deepchecks.{config['domain']}.datasets.{config['algo']}.{config['dataset']}"
-                f".load_dataset(train=True, object_type='VisionData')"
-            )
-        else:
-            df_train, df_test = eval(
-                f"deepchecks.{config['domain']}.datasets.{config['algo']}.{config['dataset']}"
-                f".load_data(data_format='Dataframe')"
-            )
-        self.df_train = Payload(df_train)
-        self.df_test = Payload(df_test)
-        print(self.df_train.value)
+            # Vision data is streamed by every suite work from its own loaders, only a reference is handed off.
+            self.df_train = vision_reference(config, train=True, loader_options=self.vision_loader)
+            self.df_test = vision_reference(config, train=False, loader_options=self.vision_loader)
+            self.metrics = metrics.finish()
+            print("Finished data collection.")
+            return
+
+        with metrics.phase("fetch"):
+            df_train, df_test = self._fetch(config, metrics)
+        print(df_train)
+
+        if self.sampling_options is not None:
+            with metrics.phase("sample"):
+                df_train, df_test = self._sample(df_train, df_test, config)
+
+        with metrics.phase("handoff"):
+            self._handoff(df_train, df_test, config)
+
+        self.metrics = metrics.finish()
         print("Finished data collection.")
 
+    def _fetch(self, config: dict, metrics: RunMetrics):
+        # Vision datasets are cached on disk by deepchecks itself, tabular ones are kept in the dataset cache.
+        dataset = get_dataset(config["domain"], config["algo"], config["dataset"])
+        cache = DatasetCache(self.dataset_cache_dir, self.max_dataset_cache_size)
+        df_train, df_test = cache.fetch(
+            cache.key(config["domain"], config["algo"], config["dataset"]),
+            lambda: getattr(load_module(dataset), dataset["loader"])(data_format="Dataframe"),
+        )
+        metrics.cache_hits, metrics.cache_misses = cache.hits, cache.misses
+        return df_train, df_test
+
+    def _sample(self, df_train, df_test, config: dict):
+        dataset = get_dataset(config["domain"], config["algo"], config["dataset"])
+        label, cat_features = dataset["target"], dataset["cat_features"]
+        df_train, train_sampling = sample_frame(df_train, label, cat_features, self.sampling_options)
+        df_test, test_sampling = sample_frame(df_test, label, cat_features, self.sampling_options)
+        self.sampling = {"train": train_sampling, "test": test_sampling}
+        print(f"Sampled {train_sampling['sample_rows']} train and {test_sampling['sample_rows']} test rows.")
+        return df_train, df_test
+
+    def _handoff(self, df_train, df_test, config: dict):
+        dataset = get_dataset(config["domain"], config["algo"], config["dataset"])
+        self.df_train, self.df_test, self.memory_usage = hand_off(
+            df_train, df_test, self.handoff, self.name, dataset["target"], dataset["cat_features"]
+        )
+
+
+def _check_workers(config: dict, check_workers: Optional[int]) -> Optional[int]:
+    # Vision data holds data loaders, which are not shipped to other processes.
+    return 1 if config["domain"] == "vision" else check_workers
+
+
+class ModelRegistry(L.LightningWork):
+    """This component keeps the fitted tabular models warm in memory and publishes their predictions with a PayLoad.
 
-class DataIntegrityCheck(L.LightningWork):
-    def __init__(self):
+    The prediction arrays, the model classes and the feature importance are published, cached by model and data
+    fingerprint, so a run over unchanged data costs no predict. The model is pickled once to ``model_path``, only the
+    checks which use the model itself load it.
+    """
+
+    def __init__(self, batch_size: int = 100_000, cloud_compute: Optional[L.CloudCompute] = None):
         cloud_build_config = CustomBuildConfig()
 
-        super().__init__(cloud_build_config=cloud_build_config)
+        super().__init__(cloud_build_config=cloud_build_config, cloud_compute=cloud_compute)
+        self.batch_size = batch_size
+        self.predictions = None
+        self.model_path = None
+        self.metrics = None
+        # Private attributes aren't part of the state, the models and their outputs stay in this process across runs.
+        self._models = {}
+        # Model key to the data fingerprint and the outputs computed for it, only the latest data is kept per model.
+        self._outputs = {}
+
+    def run(
+        self,
+        df_train: Union[Payload, Path, dict],
+        df_test: Union[Payload, Path, dict],
+        config: dict,
+        run_id: Optional[str] = None,
+    ):
+        print(f"Starting {config['dataset']} model predictions...")
+        metrics = RunMetrics("model_registry", df_train, df_test)
+        self.predictions, self.model_path = None, None
+        if config["domain"] == "vision":
+            # Vision suites run the model on their own batches.
+            print("Skipping model predictions, the vision suites predict on their own batches.")
+            return
+
+        import deepchecks
+        from deepchecks.tabular.feature_importance import calculate_feature_importance
+
+        dataset = get_dataset(config["domain"], config["algo"], config["dataset"])
+        key = (config["domain"], config["algo"], config["dataset"], deepchecks.__version__)
+        with metrics.phase("load"):
+            train = read_dataset(df_train, dataset["target"], dataset["cat_features"])
+            test = read_dataset(df_test, dataset["target"], dataset["cat_features"])
+            data_fingerprint = fingerprint(train.data, test.data)
+
+        if self._outputs.get(key, (None,))[0] == data_fingerprint:
+            metrics.cache_hits += 1
+        else:
+            metrics.cache_misses += 1
+            with metrics.phase("load_model"):
+                if key not in self._models:
+                    self._models[key] = load_module(dataset).load_fitted_model()
+            model = self._models[key]
+
+            outputs = {}
+            with metrics.phase("predict"):
+                for split, data in (("train", train), ("test", test)):
+                    outputs[f"y_pred_{split}"] = self._predict(model.predict, data.features_columns)
+                    if config["algo"] == "classification" and hasattr(model, "predict_proba"):
+                        outputs[f"y_proba_{split}"] = self._predict(model.predict_proba, data.features_columns)
+                if hasattr(model, "classes_"):
+                    outputs["model_classes"] = list(model.classes_)
+            with metrics.phase("feature_importance"):
+                outputs["feature_importance"] = calculate_feature_importance(model, train)
+            self._outputs[key] = (data_fingerprint, outputs)
+
+        self.predictions = Payload(self._outputs[key][1])
+        if not os.path.exists(self._model_file(key)):
+            with metrics.phase("save_model"):
+                self._save_model(key, self._models[key])
+        self.model_path = Path(self._model_file(key))
+        self.metrics = metrics.finish()
+        print("Finished model predictions.")
+
+    def _model_file(self, key: tuple) -> str:
+        return os.path.join("models", self.name, "-".join(key) + ".pkl")
+
+    def _save_model(self, key: tuple, model):
+        path = self._model_file(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump(model, f)
+        os.replace(path + ".tmp", path)
+
+    def _predict(self, predict_fn, features):
+        import numpy as np
+
+        batches = [
+            np.asarray(predict_fn(features.iloc[start : start + self.batch_size]))
+            for start in range(0, len(features), self.batch_size)
+        ]
+        return np.concatenate(batches)
+
+
+class _SuiteWork(L.LightningWork):
+    """Runs deepchecks suites and saves their reports to the ``suite_results`` drive."""
+
+    def __init__(
+        self,
+        parallel: bool = False,
+        compression: str = "gzip",
+        check_workers: Optional[int] = 1,
+        cloud_compute: Optional[L.CloudCompute] = None,
+        shared_assets: bool = False,
+    ):
+        cloud_build_config = CustomBuildConfig()
+
+        super().__init__(cloud_build_config=cloud_build_config, parallel=parallel, cloud_compute=cloud_compute)
         self.dir_path = "suite_results"
-        self.train_results_path = None
-        self.test_results_path = None
+        self.drive = Drive("lit://suite_results")
+        self.compression = compression
+        # Store the plotly.js bundle and the other embedded scripts once, shared by all the reports.
+        self.shared_assets = shared_assets
+        # Number of processes running the checks of tabular suites, ``None`` uses all the available CPUs.
+        self.check_workers = check_workers
+        self.metrics = None
         self.processed = False
 
-    def run(self, df_train: Payload, df_test: Payload, config: dict):
+
+class DataIntegrityCheck(_SuiteWork):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.train_report = None
+        self.test_report = None
+        # Descriptors of the per-check JSON results, read by the viewer.
+        self.train_report_json = None
+        self.test_report_json = None
+
+    def run(
+        self,
+        df_train: Union[Payload, Path, dict],
+        df_test: Union[Payload, Path, dict],
+        config: dict,
+        run_id: Optional[str] = None,
+    ):
         print(f"Starting {config['dataset']} Data Integrity Check....")
-        self.train_results_path, self.test_results_path = None, None
+        metrics = RunMetrics("data_integrity", df_train, df_test)
+        self.train_report, self.test_report = None, None
+        self.train_report_json, self.test_report_json = None, None
         self.processed = False
 
-        deepchecks_suites_module = importlib.import_module(f"deepchecks.{config['domain']}.suites")
-        deepchecks_module = importlib.import_module(
-            f"deepchecks.{config['domain']}.datasets.{config['algo']}.{config['dataset']}"
-        )
-        if config["domain"] == "vision":
-            df_train, df_test = df_train.value, df_test.value
-        else:
-            df_train = Dataset(
-                df_train.value,
-                label=deepchecks_module._target,
-                cat_features=deepchecks_module._CAT_FEATURES,
-            )
-            df_test = Dataset(
-                df_test.value,
-                label=deepchecks_module._target,
-                cat_features=deepchecks_module._CAT_FEATURES,
+        with metrics.phase("dataset"):
+            deepchecks_suites_module = importlib.import_module(f"deepchecks.{config['domain']}.suites")
+            dataset = get_dataset(config["domain"], config["algo"], config["dataset"])
+            if config["domain"] == "vision":
+                df_train, df_test = load_vision_data(df_train), load_vision_data(df_test)
+            else:
+                df_train = read_dataset(df_train, dataset["target"], dataset["cat_features"])
+                df_test = read_dataset(df_test, dataset["target"], dataset["cat_features"])
+
+        with metrics.phase("checks"):
+            train_results, test_results = run_suites(
+                [
+                    (deepchecks_suites_module.data_integrity(), [df_train]),
+                    (deepchecks_suites_module.data_integrity(), [df_test]),
+                ],
+                max_workers=_check_workers(config, self.check_workers),
             )
 
-        train_results = deepchecks_suites_module.data_integrity().run(df_train)
-        test_results = deepchecks_suites_module.data_integrity().run(df_test)
-
         os.makedirs(self.dir_path, exist_ok=True)
 
         run_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         train_results_path = os.path.join(self.dir_path, f"{config['dataset']}_train_integrity_{run_time}.html")
         test_results_path = os.path.join(self.dir_path, f"{config['dataset']}_test_integrity_{run_time}.html")
 
-        train_results.save_as_html(train_results_path, as_widget=False)
-        test_results.save_as_html(test_results_path, as_widget=False)
-
-        with open(train_results_path, encoding="utf-8") as f:
-            self.train_results_path = f.read()
+        with metrics.phase("render"):
+            train_results.save_as_html(train_results_path, as_widget=False)
+            test_results.save_as_html(test_results_path, as_widget=False)
 
-        with open(test_results_path, encoding="utf-8") as f:
-            self.test_results_path = f.read()
+            self.train_report = save_report(train_results_path, self.drive, self.compression, self.shared_assets)
+            self.test_report = save_report(test_results_path, self.drive, self.compression, self.shared_assets)
+            self.train_report_json = save_result_json(train_results, train_results_path, self.drive, self.compression)
+            self.test_report_json = save_result_json(test_results, test_results_path, self.drive, self.compression)
 
+        self.metrics = metrics.finish(self.train_report["size"] + self.test_report["size"])
         self.processed = True
         print("Finished data integrity check.")
 
 
-class TrainTestValidation(L.LightningWork):
-    def __init__(self):
-        cloud_build_config = CustomBuildConfig()
-
-        super().__init__(cloud_build_config=cloud_build_config)
-        self.dir_path = "suite_results"
-        self.results_path = None
-        self.processed = False
-
-    def run(self, df_train: Payload, df_test: Payload, config: dict):
+class TrainTestValidation(_SuiteWork):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.report = None
+        # Descriptor of the per-check JSON result, read by the viewer.
+        self.report_json = None
+
+    def run(
+        self,
+        df_train: Union[Payload, Path, dict],
+        df_test: Union[Payload, Path, dict],
+        config: dict,
+        run_id: Optional[str] = None,
+    ):
         print(f"Starting {config['dataset']} train test validation suite...")
-        self.results_path = None
+        metrics = RunMetrics("train_test_validation", df_train, df_test)
+        self.report, self.report_json = None, None
         self.processed = False
 
-        deepchecks_suites_module = importlib.import_module(f"deepchecks.{config['domain']}.suites")
-        deepchecks_module = importlib.import_module(
-            f"deepchecks.{config['domain']}.datasets.{config['algo']}.{config['dataset']}"
-        )
+        with metrics.phase("dataset"):
+            deepchecks_suites_module = importlib.import_module(f"deepchecks.{config['domain']}.suites")
+            dataset = get_dataset(config["domain"], config["algo"], config["dataset"])
 
-        if config["domain"] == "vision":
-            df_train, df_test = df_train.value, df_test.value
-        else:
-            df_train = Dataset(
-                df_train.value,
-                label=deepchecks_module._target,
-                cat_features=deepchecks_module._CAT_FEATURES,
-            )
-            df_test = Dataset(
-                df_test.value,
-                label=deepchecks_module._target,
-                cat_features=deepchecks_module._CAT_FEATURES,
-            )
+            if config["domain"] == "vision":
+                df_train, df_test = load_vision_data(df_train), load_vision_data(df_test)
+            else:
+                df_train = read_dataset(df_train, dataset["target"], dataset["cat_features"])
+                df_test = read_dataset(df_test, dataset["target"], dataset["cat_features"])
 
-        train_test_validation_results = deepchecks_suites_module.train_test_validation().run(df_train, df_test)
+        with metrics.phase("checks"):
+            (train_test_validation_results,) = run_suites(
+                [(deepchecks_suites_module.train_test_validation(), [df_train, df_test])],
+                max_workers=_check_workers(config, self.check_workers),
+            )
 
         os.makedirs(self.dir_path, exist_ok=True)
 
         run_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         results_path = os.path.join(self.dir_path, f"{config['dataset']}_train_test_validation_{run_time}.html")
 
-        train_test_validation_results.save_as_html(results_path, as_widget=False)
-
-        with open(results_path, encoding="utf-8") as f:
-            self.results_path = f.read()
+        with metrics.phase("render"):
+            train_test_validation_results.save_as_html(results_path, as_widget=False)
+            self.report = save_report(results_path, self.drive, self.compression, self.shared_assets)
+            self.report_json = save_result_json(
+                train_test_validation_results, results_path, self.drive, self.compression
+            )
 
+        self.metrics = metrics.finish(self.report["size"])
         self.processed = True
 
         print("Finished train test validation suite.")
 
 
-class ModelEvaluation(L.LightningWork):
-    def __init__(self):
-        cloud_build_config = CustomBuildConfig()
-
-        super().__init__(cloud_build_config=cloud_build_config)
-        self.dir_path = "suite_results"
-        self.results_path = None
-        self.processed = False
-
-    def run(self, df_train: Payload, df_test: Payload, config: dict):
+class ModelEvaluation(_SuiteWork):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.report = None
+        # Descriptor of the per-check JSON result, read by the viewer.
+        self.report_json = None
+
+    def run(
+        self,
+        df_train: Union[Payload, Path, dict],
+        df_test: Union[Payload, Path, dict],
+        config: dict,
+        predictions: Optional[Payload] = None,
+        model_path: Optional[Path] = None,
+        run_id: Optional[str] = None,
+    ):
         print(f"Starting {config['dataset']} model evaluation suite...")
-        self.results_path = None
+        metrics = RunMetrics("model_evaluation", df_train, df_test)
+        self.report, self.report_json = None, None
         self.processed = False
 
         if config["dataset"] == "coco":
@@ -180,7 +385,8 @@ class ModelEvaluation(L.LightningWork):
             with open(results_path, "w") as file:
                 file.write(results)
 
-            self.results_path = results
+            self.report = save_report(results_path, self.drive, self.compression, self.shared_assets)
+            self.metrics = metrics.finish(self.report["size"])
             self.processed = True
 
             print("Finished model evaluation suite.")
@@ -188,37 +394,46 @@ class ModelEvaluation(L.LightningWork):
 
         deepchecks_suites_module = importlib.import_module(f"deepchecks.{config['domain']}.suites")
 
-        deepchecks_module = importlib.import_module(
-            f"deepchecks.{config['domain']}.datasets.{config['algo']}.{config['dataset']}"
-        )
-
-        if config["domain"] == "vision":
-            model = deepchecks_module.load_model()
-            df_train, df_test = df_train.value, df_test.value
-        else:
-            model = deepchecks_module.load_fitted_model()
-
-            df_train = Dataset(
-                df_train.value,
-                label=deepchecks_module._target,
-                cat_features=deepchecks_module._CAT_FEATURES,
-            )
-            df_test = Dataset(
-                df_test.value,
-                label=deepchecks_module._target,
-                cat_features=deepchecks_module._CAT_FEATURES,
+        dataset = get_dataset(config["domain"], config["algo"], config["dataset"])
+        deepchecks_module = load_module(dataset)
+
+        # The tabular checks run on the predictions published by the ``ModelRegistry``, only the ones listed in
+        # ``MODEL_CHECKS`` use the model, unpickled from the registry rather than loaded again.
+        with metrics.phase("load_model"):
+            shared = predictions.value if predictions is not None else {}
+            if shared and model_path is not None:
+                with open(model_path, "rb") as f:
+                    model = pickle.load(f)
+            elif config["domain"] == "vision":
+                model = deepchecks_module.load_model()
+            else:
+                model = deepchecks_module.load_fitted_model()
+
+        with metrics.phase("dataset"):
+            if config["domain"] == "vision":
+                df_train, df_test = load_vision_data(df_train), load_vision_data(df_test)
+            else:
+                df_train = read_dataset(df_train, dataset["target"], dataset["cat_features"])
+                df_test = read_dataset(df_test, dataset["target"], dataset["cat_features"])
+
+        with metrics.phase("checks"):
+            (evaluation_results,) = run_suites(
+                [(deepchecks_suites_module.model_evaluation(), [df_train, df_test, model])],
+                max_workers=_check_workers(config, self.check_workers),
+                **shared,
             )
 
-        evaluation_results = deepchecks_suites_module.model_evaluation().run(df_train, df_test, model)
-
         os.makedirs(self.dir_path, exist_ok=True)
 
         run_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         results_path = os.path.join(self.dir_path, f"{config['dataset']}_model_evaluation_{run_time}.html")
 
-        evaluation_results.save_as_html(results_path, as_widget=False)
-        with open(results_path, encoding="utf-8") as f:
-            self.results_path = f.read()
+        with metrics.phase("render"):
+            evaluation_results.save_as_html(results_path, as_widget=False)
+            self.report = save_report(results_path, self.drive, self.compression, self.shared_assets)
+            self.report_json = save_result_json(evaluation_results, results_path, self.drive, self.compression)
+
+        self.metrics = metrics.finish(self.report["size"])
         self.processed = True
 
         print("Finished model evaluation suite.")
@@ -0,0 +1,120 @@
+from typing import Optional
+
+import lightning as L
+from lightning.app.structures import List
+
+from lightning_deepchecks.demo.components import (
+    DataIntegrityCheck,
+    GetDataWork,
+    ModelEvaluation,
+    ModelRegistry,
+    TrainTestValidation,
+)
+
+SUITES = ["Data Integrity", "Train Test Validation", "Model Evaluation"]
+
+
+def _cloud_compute(name: Optional[str]) -> Optional[L.CloudCompute]:
+    # A ``CloudCompute`` can only be attached to a single work.
+    return L.CloudCompute(name) if name else None
+
+
+class DeepchecksSuites(L.LightningFlow):
+    """Runs the selected suites of one dataset, sharing its collected data and its model between them.
+
+    ``cloud_compute`` names the machine of the suite works and of the model registry, such as ``"gpu"``, the data
+    collection runs on the default one. With ``shared_assets=True`` the reports reference shared scripts instead of
+    embedding their own copy. ``sampling`` options reduce tabular data to a stratified sample before the suites run.
+    """
+
+    def __init__(
+        self,
+        parallel: bool = False,
+        handoff: str = "payload",
+        check_workers: Optional[int] = 1,
+        vision_loader: Optional[dict] = None,
+        cloud_compute: Optional[str] = None,
+        shared_assets: bool = False,
+        sampling: Optional[dict] = None,
+    ):
+        super().__init__()
+        self.data_collector = GetDataWork(handoff=handoff, vision_loader=vision_loader, sampling=sampling)
+        # With ``parallel=True`` the selected suites fan out as soon as the data is collected.
+        self.data_integrity_check = DataIntegrityCheck(
+            parallel=parallel,
+            check_workers=check_workers,
+            cloud_compute=_cloud_compute(cloud_compute),
+            shared_assets=shared_assets,
+        )
+        self.train_test_validation = TrainTestValidation(
+            parallel=parallel,
+            check_workers=check_workers,
+            cloud_compute=_cloud_compute(cloud_compute),
+            shared_assets=shared_assets,
+        )
+        self.model_evaluation = ModelEvaluation(
+            parallel=parallel,
+            check_workers=check_workers,
+            cloud_compute=_cloud_compute(cloud_compute),
+            shared_assets=shared_assets,
+        )
+        self.model_registry = ModelRegistry(cloud_compute=_cloud_compute(cloud_compute))
+        self.suites = List()
+        self.run_id = None
+        self.failed_suites = []
+        self.has_completed = False
+
+    def reset(self, run_id: str):
+        """Prepares the suites and their works for a new job."""
+        self.run_id = run_id
+        self.failed_suites = []
+        self.has_completed = False
+
+    def reports(self, suites: list) -> dict:
+        """Returns the report descriptors of the last job, by suite."""
+        reports = {
+            "Data Integrity": (self.data_integrity_check.train_report, self.data_integrity_check.train_report_json),
+            "Train Test Validation": (self.train_test_validation.report, self.train_test_validation.report_json),
+            "Model Evaluation": (self.model_evaluation.report, self.model_evaluation.report_json),
+        }
+        return {suite: {"report": reports[suite][0], "report_json": reports[suite][1]} for suite in suites}
+
+    def run(self, config: dict):
+        self.has_completed = False
+        self.data_collector.run(config, run_id=self.run_id)
+
+        suite_works = []
+        for suite in config["suites"]:
+            if suite not in SUITES:
+                raise ValueError(f"{suite} is not supported. Supported suites are {SUITES}")
+            if suite == "Data Integrity":
+                self.data_integrity_check.run(
+                    self.data_collector.df_train, self.data_collector.df_test, config, run_id=self.run_id
+                )
+                suite_works.append(self.data_integrity_check)
+            elif suite == "Train Test Validation":
+                self.train_test_validation.run(
+                    self.data_collector.df_train, self.data_collector.df_test, config, run_id=self.run_id
+                )
+                suite_works.append(self.train_test_validation)
+            elif suite == "Model Evaluation":
+                # The registry keeps the tabular model loaded and computes its predictions once per dataset.
+                predictions, model_path = None, None
+                if config["domain"] != "vision":
+                    self.model_registry.run(
+                        self.data_collector.df_train, self.data_collector.df_test, config, run_id=self.run_id
+                    )
+                    predictions, model_path = self.model_registry.predictions, self.model_registry.model_path
+                self.model_evaluation.run(
+                    self.data_collector.df_train,
+                    self.data_collector.df_test,
+                    config,
+                    predictions,
+                    model_path,
+                    run_id=self.run_id,
+                )
+                suite_works.append(self.model_evaluation)
+
+        self.has_completed = all(work.has_succeeded or work.has_failed for work in suite_works)
+        if self.has_completed:
+            self.failed_suites = [work.name for work in suite_works if work.has_failed]
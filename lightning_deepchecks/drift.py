@@ -0,0 +1,218 @@
+import json
+import os
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from lightning_deepchecks.cache import DEFAULT_CACHE_DIR, fingerprint
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_EPSILON = 1e-6
+
+
+class FeatureSketch:
+    """A mergeable summary of one column: a histogram over fixed bin edges for numeric columns, the category counts
+    otherwise."""
+
+    def __init__(self, kind: str, edges: Optional[List[float]] = None, counts: Optional[dict] = None, nulls: int = 0):
+        self.kind = kind
+        self.edges = edges
+        self.counts = counts if counts is not None else {}
+        self.nulls = nulls
+
+    @classmethod
+    def for_reference(cls, column, categorical: bool, n_bins: int) -> "FeatureSketch":
+        import numpy as np
+
+        if categorical:
+            return cls("categorical")
+        values = column.dropna().to_numpy(dtype=float)
+        quantiles = np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1]) if len(values) else []
+        return cls("numeric", edges=sorted(set(float(q) for q in quantiles)))
+
+    def empty_like(self) -> "FeatureSketch":
+        return FeatureSketch(self.kind, edges=self.edges)
+
+    def update(self, column):
+        import numpy as np
+
+        self.nulls += int(column.isna().sum())
+        column = column.dropna()
+        if self.kind == "categorical":
+            values = column.astype(str).value_counts()
+        else:
+            # Bin i holds the values in ]edges[i - 1], edges[i]], the outer bins catch values out of the reference.
+            bins = np.searchsorted(self.edges, column.to_numpy(dtype=float), side="left")
+            uniques, bin_counts = np.unique(bins, return_counts=True)
+            values = dict(zip((str(b) for b in uniques), bin_counts))
+        for key, count in dict(values).items():
+            self.counts[key] = self.counts.get(key, 0) + int(count)
+
+    def merge(self, other: "FeatureSketch"):
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.nulls += other.nulls
+
+    def distribution(self, keys: List[str]) -> "np.ndarray":
+        import numpy as np
+
+        counts = np.array([self.counts.get(key, 0) for key in keys], dtype=float)
+        return counts / max(counts.sum(), 1.0)
+
+    def to_dict(self) -> dict:
+        return {"kind": self.kind, "edges": self.edges, "counts": self.counts, "nulls": self.nulls}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FeatureSketch":
+        return cls(data["kind"], edges=data["edges"], counts=data["counts"], nulls=data["nulls"])
+
+
+class DatasetSketch:
+    """Per-feature sketches of a DataFrame, plus the label distribution."""
+
+    def __init__(self, features: Dict[str, FeatureSketch], rows: int = 0):
+        self.features = features
+        self.rows = rows
+
+    @classmethod
+    def for_reference(cls, df, label: str, cat_features: List[str], n_bins: int = 20) -> "DatasetSketch":
+        """Sketches ``df``, the columns of ``cat_features`` and any column that isn't numeric, such as an undeclared
+        string column, as categorical ones."""
+        import pandas as pd
+
+        features = {}
+        for name in df.columns:
+            categorical = name in cat_features or not pd.api.types.is_numeric_dtype(df[name])
+            features[name] = FeatureSketch.for_reference(df[name], categorical, n_bins)
+        sketch = cls(features)
+        sketch.update(df)
+        return sketch
+
+    def empty_like(self) -> "DatasetSketch":
+        return DatasetSketch({name: sketch.empty_like() for name, sketch in self.features.items()})
+
+    def update(self, df):
+        for name, sketch in self.features.items():
+            if name in df.columns:
+                sketch.update(df[name])
+        self.rows += len(df)
+
+    def merge(self, other: "DatasetSketch"):
+        for name, sketch in self.features.items():
+            sketch.merge(other.features[name])
+        self.rows += other.rows
+
+    def to_dict(self) -> dict:
+        return {"rows": self.rows, "features": {name: sketch.to_dict() for name, sketch in self.features.items()}}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DatasetSketch":
+        features = {name: FeatureSketch.from_dict(sketch) for name, sketch in data["features"].items()}
+        return cls(features, rows=data["rows"])
+
+
+def drift_scores(reference: DatasetSketch, current: DatasetSketch) -> Dict[str, dict]:
+    """Scores the drift of every feature between two sketches sharing the same bins.
+
+    Numeric features are scored with the Kolmogorov-Smirnov statistic and Earth Mover's distance over the bins,
+    categorical ones with Cramer's V. The PSI is reported for both.
+    """
+    import numpy as np
+
+    scores = {}
+    for name, ref_sketch in reference.features.items():
+        cur_sketch = current.features[name]
+        if ref_sketch.kind == "numeric":
+            keys = [str(i) for i in range(len(ref_sketch.edges) + 1)]
+        else:
+            keys = sorted(set(ref_sketch.counts) | set(cur_sketch.counts))
+        expected, actual = ref_sketch.distribution(keys), cur_sketch.distribution(keys)
+        psi = float(np.sum((actual - expected) * np.log((actual + _EPSILON) / (expected + _EPSILON))))
+
+        if ref_sketch.kind == "numeric":
+            cdf_diff = np.abs(np.cumsum(actual) - np.cumsum(expected))
+            score = {"method": "Kolmogorov-Smirnov", "drift_score": float(cdf_diff.max(initial=0.0))}
+            score["earth_movers_distance"] = float(cdf_diff.sum() / max(len(keys) - 1, 1))
+        else:
+            score = {"method": "Cramer's V", "drift_score": _cramers_v(ref_sketch, cur_sketch, keys)}
+        score["psi"] = psi
+        scores[name] = score
+    return scores
+
+
+def _cramers_v(reference: FeatureSketch, current: FeatureSketch, keys: List[str]) -> float:
+    import numpy as np
+
+    table = np.array([[sketch.counts.get(key, 0) for key in keys] for sketch in (reference, current)], dtype=float)
+    table = table[:, table.sum(axis=0) > 0]
+    total = table.sum()
+    if total == 0 or table.shape[1] < 2:
+        return 0.0
+    expected = table.sum(axis=1, keepdims=True) * table.sum(axis=0, keepdims=True) / total
+    chi2 = float(np.sum((table - expected) ** 2 / expected))
+    return float(np.sqrt(chi2 / total))
+
+
+class DriftMonitor:
+    """Persists the sketch of a reference set and the sketch of every window merged so far.
+
+    The reference is only sketched again when its fingerprint changes, each run then costs a pass over the new window.
+    """
+
+    def __init__(self, reference_id: str, store_dir: Optional[str] = None, max_windows: int = 1000):
+        self.store_dir = store_dir or os.path.join(DEFAULT_CACHE_DIR, "sketches")
+        self.path = os.path.join(self.store_dir, f"{reference_id}.json")
+        self.max_windows = max_windows
+        self.reference = None
+        self.reference_fingerprint = None
+        self.cumulative = None
+        self.windows = []
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                data = json.load(f)
+            self.reference = DatasetSketch.from_dict(data["reference"])
+            self.reference_fingerprint = data.get("reference_fingerprint")
+            self.cumulative = DatasetSketch.from_dict(data["cumulative"])
+            self.windows = data["windows"]
+
+    @property
+    def has_reference(self) -> bool:
+        return self.reference is not None
+
+    def is_reference(self, df) -> bool:
+        """Whether the persisted sketches were built against ``df``, they are stale otherwise."""
+        return self.has_reference and self.reference_fingerprint == fingerprint(df)
+
+    def set_reference(self, df, label: str, cat_features: List[str]):
+        self.reference = DatasetSketch.for_reference(df, label, cat_features)
+        self.reference_fingerprint = fingerprint(df)
+        self.cumulative = self.reference.empty_like()
+        self.windows = []
+
+    def observe(self, df) -> Dict[str, Dict[str, dict]]:
+        """Scores the drift of the window ``df`` and of all the windows seen so far against the reference."""
+        window = self.reference.empty_like()
+        window.update(df)
+
+        # The same window may be scheduled more than once, only count it in the history the first time.
+        window_id = fingerprint(df)
+        if window_id not in self.windows:
+            self.cumulative.merge(window)
+            self.windows = [*self.windows, window_id][-self.max_windows :]
+
+        return {
+            "window": drift_scores(self.reference, window),
+            "cumulative": drift_scores(self.reference, self.cumulative),
+        }
+
+    def save(self):
+        os.makedirs(self.store_dir, exist_ok=True)
+        data = {
+            "reference": self.reference.to_dict(),
+            "reference_fingerprint": self.reference_fingerprint,
+            "cumulative": self.cumulative.to_dict(),
+            "windows": self.windows,
+        }
+        with open(self.path + ".tmp", "w") as f:
+            json.dump(data, f)
+        os.replace(self.path + ".tmp", self.path)
@@ -0,0 +1,86 @@
+import os
+from typing import List, Optional, Tuple, Union
+
+from lightning.app.storage import Path, Payload
+
+HANDOFF_MODES = ("payload", "arrow", "dataset")
+# The Arrow handoffs are written under this directory of the app, one subdirectory per work.
+HANDOFF_DIR = "handoff"
+
+
+def write_frame(df, path: str) -> Path:
+    """Writes ``df`` once as an uncompressed Arrow IPC file, which consumers can memory-map."""
+    import pyarrow as pa
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return Path(path)
+
+
+def read_frame(data: Union[Payload, Path, str]):
+    """Returns the data handed off by a ``GetDataWork``, either as a Payload or as an Arrow IPC file."""
+    if isinstance(data, Payload):
+        return data.value
+
+    import pyarrow as pa
+
+    # The table buffers point into the memory map, so pages are shared between works on the same machine.
+    table = pa.ipc.open_file(pa.memory_map(str(data), "r")).read_all()
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def optimize_dtypes(df, label: str, cat_features: List[str]):
+    """Returns a copy of ``df`` with categorical dtypes for ``cat_features`` and downcast numeric features."""
+    import pandas as pd
+
+    df = df.copy()
+    for column in df.columns:
+        if column in cat_features:
+            df[column] = df[column].astype("category")
+        elif column != label and df[column].dtype.kind in "iu":
+            df[column] = pd.to_numeric(df[column], downcast="integer")
+        elif column != label and df[column].dtype.kind == "f":
+            df[column] = pd.to_numeric(df[column], downcast="float")
+    return df
+
+
+def prepare_dataset(df, label: str, cat_features: List[str]):
+    """Builds the deepchecks ``Dataset`` once from the dtype-optimized ``df``, for the suites to consume as is."""
+    from deepchecks.tabular import Dataset
+
+    before = int(df.memory_usage(deep=True).sum())
+    df = optimize_dtypes(df, label, cat_features)
+    after = int(df.memory_usage(deep=True).sum())
+    print(f"Optimized dtypes: {before / 1e6:.1f}MB -> {after / 1e6:.1f}MB")
+    return Dataset(df, label=label, cat_features=cat_features), {"before": before, "after": after}
+
+
+def read_dataset(data: Union[Payload, Path, str], label: str, cat_features: List[str]):
+    """Returns the deepchecks ``Dataset`` handed off by a ``GetDataWork``, only building it when a DataFrame was
+    handed off."""
+    from deepchecks.tabular import Dataset
+
+    value = read_frame(data)
+    if isinstance(value, Dataset):
+        return value
+    return Dataset(value, label=label, cat_features=cat_features)
+
+
+def hand_off(
+    df_train, df_test, mode: str, work_name: str, label: str, cat_features: List[str]
+) -> Tuple[Union[Payload, Path], Union[Payload, Path], Optional[dict]]:
+    """Returns the train and test handoffs of a ``GetDataWork`` in the ``mode`` handoff, and the memory usage of the
+    datasets built by the ``"dataset"`` mode."""
+    if mode == "arrow":
+        # Serialize once, every suite work memory-maps the same files.
+        df_train = write_frame(df_train, os.path.join(HANDOFF_DIR, work_name, "df_train.arrow"))
+        df_test = write_frame(df_test, os.path.join(HANDOFF_DIR, work_name, "df_test.arrow"))
+        return df_train, df_test, None
+    if mode == "dataset":
+        # Build the deepchecks datasets once, the suites use them as they are.
+        dataset_train, train_memory_usage = prepare_dataset(df_train, label, cat_features)
+        dataset_test, test_memory_usage = prepare_dataset(df_test, label, cat_features)
+        return Payload(dataset_train), Payload(dataset_test), {"train": train_memory_usage, "test": test_memory_usage}
+    return Payload(df_train), Payload(df_test), None
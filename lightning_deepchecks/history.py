@@ -0,0 +1,204 @@
+import math
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Dict, List, Optional, Tuple
+
+from lightning_deepchecks.cache import DEFAULT_CACHE_DIR
+from lightning_deepchecks.conditions import check_status
+
+# Nested check values can hold thousands of numbers, only this many are indexed per check.
+MAX_METRICS_PER_CHECK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT,
+    dataset TEXT NOT NULL,
+    suite TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    data_fingerprint TEXT,
+    model_fingerprint TEXT,
+    report_path TEXT,
+    report_bytes INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS runs_by_suite ON runs (dataset, suite, created_at);
+CREATE TABLE IF NOT EXISTS checks (
+    run INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    check_name TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS checks_by_run ON checks (run, check_name);
+CREATE TABLE IF NOT EXISTS metrics (
+    run INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    check_name TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS metrics_by_check ON metrics (check_name, metric, run);
+"""
+
+
+def flatten_values(value, prefix: str = "") -> Dict[str, float]:
+    """Returns the numeric leaves of a nested check value, keyed by their dotted path."""
+    if isinstance(value, bool):
+        return {prefix: float(value)}
+    if isinstance(value, (int, float)):
+        return {prefix: float(value)} if math.isfinite(value) else {}
+    if hasattr(value, "item") and getattr(value, "shape", None) == ():
+        return flatten_values(value.item(), prefix)
+    if isinstance(value, dict):
+        flat = {}
+        for key, item in value.items():
+            flat.update(flatten_values(item, f"{prefix}.{key}" if prefix else str(key)))
+        return flat
+    return {}
+
+
+def summarize_suite_result(result) -> Dict[str, dict]:
+    """Returns the status and the numeric values of every check of a ``SuiteResult``, by check header."""
+    checks = {}
+    for check_result in result.results:
+        header = check_result.get_header() if hasattr(check_result, "get_header") else type(check_result).__name__
+        metrics = flatten_values(getattr(check_result, "value", None))
+        checks[header] = {
+            "status": check_status(check_result),
+            "metrics": dict(list(metrics.items())[:MAX_METRICS_PER_CHECK]),
+        }
+    return checks
+
+
+class RunHistory:
+    """An SQLite index of the suite runs: their inputs fingerprints, per-check status and numeric check values.
+
+    Trend queries read the index only, never the reports. ``compact`` bounds the disk usage: runs older than
+    ``max_age_days`` or beyond ``max_runs`` per dataset and suite are dropped, and only the reports of the last
+    ``max_report_runs`` runs, within ``max_report_bytes`` overall, are kept on disk.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_age_days: float = 90,
+        max_runs: int = 24 * 90,
+        max_report_runs: int = 24 * 7,
+        max_report_bytes: int = 1024**3,
+    ):
+        self.db_path = db_path or os.path.join(DEFAULT_CACHE_DIR, "history.sqlite")
+        self.max_age_days = max_age_days
+        self.max_runs = max_runs
+        self.max_report_runs = max_report_runs
+        self.max_report_bytes = max_report_bytes
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Every suite work records its runs, the WAL journal lets them write while the others read.
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA foreign_keys=ON")
+        return connection
+
+    def record(
+        self,
+        dataset: str,
+        suite: str,
+        checks: Dict[str, dict],
+        run_id: Optional[str] = None,
+        report_path: Optional[str] = None,
+        data_fingerprint: Optional[str] = None,
+        model_fingerprint: Optional[str] = None,
+        created_at: Optional[float] = None,
+    ) -> int:
+        """Indexes a run, ``checks`` maps the check names to their ``status`` and numeric ``metrics``."""
+        report_bytes = os.path.getsize(report_path) if report_path and os.path.exists(report_path) else 0
+        with closing(self._connect()) as connection, connection:
+            cursor = connection.execute(
+                "INSERT INTO runs (run_id, dataset, suite, created_at, data_fingerprint, model_fingerprint,"
+                " report_path, report_bytes) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    dataset,
+                    suite,
+                    created_at or time.time(),
+                    data_fingerprint,
+                    model_fingerprint,
+                    report_path,
+                    report_bytes,
+                ),
+            )
+            run = cursor.lastrowid
+            connection.executemany(
+                "INSERT INTO checks (run, check_name, status) VALUES (?, ?, ?)",
+                [(run, name, check["status"]) for name, check in checks.items()],
+            )
+            connection.executemany(
+                "INSERT INTO metrics (run, check_name, metric, value) VALUES (?, ?, ?, ?)",
+                [
+                    (run, name, metric, value)
+                    for name, check in checks.items()
+                    for metric, value in check.get("metrics", {}).items()
+                ],
+            )
+        return run
+
+    def trend(self, dataset: str, suite: str, check: str, metric: str, limit: int = 30) -> List[Tuple[float, float]]:
+        """Returns the ``(created_at, value)`` of a check value over the last ``limit`` runs, oldest first.
+
+        For instance ``trend("adult", "train_test_validation", "Train Test Feature Drift", "age.Drift score")``.
+        """
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT runs.created_at, metrics.value FROM metrics JOIN runs ON runs.id = metrics.run"
+                " WHERE metrics.check_name = ? AND metrics.metric = ? AND runs.dataset = ? AND runs.suite = ?"
+                " ORDER BY runs.created_at DESC LIMIT ?",
+                (check, metric, dataset, suite, limit),
+            ).fetchall()
+        return rows[::-1]
+
+    def statuses(self, dataset: str, suite: str, limit: int = 30) -> List[Tuple[float, str, str]]:
+        """Returns the ``(created_at, check_name, status)`` of the checks of the last ``limit`` runs, oldest first."""
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT runs.created_at, checks.check_name, checks.status FROM checks"
+                " JOIN (SELECT id, created_at FROM runs WHERE dataset = ? AND suite = ?"
+                " ORDER BY created_at DESC LIMIT ?) AS runs ON runs.id = checks.run"
+                " ORDER BY runs.created_at",
+                (dataset, suite, limit),
+            ).fetchall()
+        return rows
+
+    def compact(self):
+        """Applies the retention policies, deleting the dropped runs and the reports beyond the budget."""
+        with closing(self._connect()) as connection, connection:
+            cutoff = time.time() - self.max_age_days * 24 * 3600
+            expired = connection.execute(
+                "SELECT id, report_path FROM runs WHERE created_at < ? OR id IN ("
+                " SELECT id FROM (SELECT id, ROW_NUMBER() OVER ("
+                "  PARTITION BY dataset, suite ORDER BY created_at DESC) AS position FROM runs)"
+                " WHERE position > ?)",
+                (cutoff, self.max_runs),
+            ).fetchall()
+            connection.executemany("DELETE FROM runs WHERE id = ?", [(run,) for run, _ in expired])
+
+            # The index outlives the reports: only the most recent ones are kept, within the byte budget.
+            reports = connection.execute(
+                "SELECT id, report_path, report_bytes, ROW_NUMBER() OVER ("
+                " PARTITION BY dataset, suite ORDER BY created_at DESC) FROM runs"
+                " WHERE report_path IS NOT NULL ORDER BY created_at DESC"
+            ).fetchall()
+            kept_bytes, dropped = 0, []
+            for run, report_path, report_bytes, position in reports:
+                if position > self.max_report_runs or kept_bytes + report_bytes > self.max_report_bytes:
+                    dropped.append((run, report_path))
+                else:
+                    kept_bytes += report_bytes
+            connection.executemany(
+                "UPDATE runs SET report_path = NULL, report_bytes = 0 WHERE id = ?", [(run,) for run, _ in dropped]
+            )
+
+        for _, report_path in [*expired, *dropped]:
+            if report_path and os.path.exists(report_path):
+                os.remove(report_path)
@@ -0,0 +1,205 @@
+import os
+import platform
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional
+
+PROMETHEUS_METRICS = {
+    "duration_s": ("deepchecks_stage_duration_seconds", "Wall time of the last run of a stage."),
+    "cpu_s": ("deepchecks_stage_cpu_seconds", "CPU time of the last run of a stage, its child processes included."),
+    "peak_rss_bytes": (
+        "deepchecks_stage_peak_rss_bytes",
+        "Peak resident memory of the last run of a stage, its child processes included.",
+    ),
+    "input_bytes": ("deepchecks_stage_input_bytes", "Size of the data handed to a stage."),
+    "report_bytes": ("deepchecks_stage_report_bytes", "Size of the reports written by a stage."),
+    "cache_hits": ("deepchecks_stage_cache_hits", "Cached results reused by the last run of a stage."),
+    "cache_misses": ("deepchecks_stage_cache_misses", "Results computed by the last run of a stage."),
+}
+
+
+# How often the memory of the child processes, such as the check workers, is sampled.
+RSS_SAMPLING_INTERVAL_S = 0.2
+
+
+def _maxrss(who: int) -> int:
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS.
+    peak = resource.getrusage(who).ru_maxrss
+    return peak if platform.system() == "Darwin" else peak * 1024
+
+
+def _cpu_time() -> float:
+    """Returns the CPU time of this process and of its terminated children, such as the check workers of a pool."""
+    return sum(
+        usage.ru_utime + usage.ru_stime
+        for usage in (resource.getrusage(resource.RUSAGE_SELF), resource.getrusage(resource.RUSAGE_CHILDREN))
+    )
+
+
+def _status_bytes(pid, field: str) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _children(pid) -> list:
+    children = []
+    try:
+        for tid in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tid}/children") as f:
+                children.extend(f.read().split())
+    except OSError:
+        pass
+    return [*children, *[grandchild for child in children for grandchild in _children(child)]]
+
+
+def _reset_peak_rss() -> bool:
+    """Resets the high-water mark of this process to its current resident memory, only supported on Linux.
+
+    This changes the accounting of the whole process, not only of the metrics: ``VmHWM`` and ``ru_maxrss`` then report
+    the peak since the last reset, for every reader of them, rather than the peak of the process lifetime.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class _ChildrenRssSampler(threading.Thread):
+    """Samples the total resident memory of the child processes, whose peaks ``ru_maxrss`` can't scope to a stage."""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peak = 0
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(RSS_SAMPLING_INTERVAL_S):
+            self.peak = max(self.peak, sum(_status_bytes(pid, "VmRSS") or 0 for pid in _children("self")))
+
+    def stop(self) -> int:
+        self._stopped.set()
+        self.join()
+        return self.peak
+
+
+def data_size(data) -> int:
+    """Returns the size of the data handed off by a ``GetDataWork``, without serializing it."""
+    from lightning.app.storage import Path, Payload
+
+    if isinstance(data, (Path, str)):
+        return os.path.getsize(data) if os.path.exists(data) else 0
+    if isinstance(data, Payload):
+        value = data.value
+        frame = getattr(value, "data", value)
+        if hasattr(frame, "memory_usage"):
+            return int(frame.memory_usage(deep=True).sum())
+    return 0
+
+
+class RunMetrics:
+    """Measures one run of a stage and the time spent in each of its phases.
+
+    The peak memory of this process is scoped to the stage by resetting its high-water mark, see ``_reset_peak_rss``.
+    The memory of the child processes, such as the check workers, is sampled by a thread running during the phases
+    only, so that no thread outlives a run which returns or raises before ``finish``.
+    """
+
+    def __init__(self, stage: str, *inputs):
+        self.stage = stage
+        self.input_bytes = sum(data_size(data) for data in inputs)
+        self.phases = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._start_cpu = _cpu_time()
+        # Works are kept alive between runs, the peaks of the previous stages must not count.
+        self._peak_reset = _reset_peak_rss()
+        self._start_children_maxrss = _maxrss(resource.RUSAGE_CHILDREN)
+        self._children_peak = 0
+        self._children_sampler = None
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        # Nested phases share the sampler of the outermost one.
+        sampler = None
+        if self._peak_reset and self._children_sampler is None:
+            sampler = self._children_sampler = _ChildrenRssSampler()
+            sampler.start()
+        try:
+            yield
+        finally:
+            if sampler is not None:
+                self._children_peak = max(self._children_peak, sampler.stop())
+                self._children_sampler = None
+            self.phases[name] = round(self.phases.get(name, 0.0) + time.perf_counter() - start, 4)
+
+    def _peak_rss(self) -> int:
+        if not self._peak_reset:
+            # Without a resettable high-water mark, only the process lifetime peaks are known.
+            return _maxrss(resource.RUSAGE_SELF) + _maxrss(resource.RUSAGE_CHILDREN)
+        peak = _status_bytes("self", "VmHWM") or _maxrss(resource.RUSAGE_SELF)
+        children_peak = self._children_peak
+        children_maxrss = _maxrss(resource.RUSAGE_CHILDREN)
+        if children_maxrss > self._start_children_maxrss:
+            # A child terminated during the stage after exceeding every previous child.
+            children_peak = max(children_peak, children_maxrss)
+        return peak + children_peak
+
+    def finish(self, report_bytes: int = 0) -> dict:
+        """Returns the compact record kept in the work state.
+
+        The CPU time and the peak memory include the child processes, such as the check workers.
+        """
+        return {
+            "stage": self.stage,
+            "started_at": self.started_at,
+            "finished_at": time.time(),
+            "duration_s": round(time.perf_counter() - self._start, 4),
+            "cpu_s": round(_cpu_time() - self._start_cpu, 4),
+            "peak_rss_bytes": self._peak_rss(),
+            "input_bytes": self.input_bytes,
+            "report_bytes": report_bytes,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "phases": self.phases,
+        }
+
+
+def collect(works: Iterable) -> Dict[str, dict]:
+    """Returns the last metrics record of every work that has one, keyed by the work name."""
+    return {work.name: work.metrics for work in works if getattr(work, "metrics", None)}
+
+
+def to_prometheus(records: Dict[str, dict], labels: Optional[Dict[str, str]] = None) -> str:
+    """Renders metrics records, keyed by work name, in the Prometheus text exposition format."""
+    lines = []
+    for key, (name, description) in PROMETHEUS_METRICS.items():
+        lines += [f"# HELP {name} {description}", f"# TYPE {name} gauge"]
+        for work_name, record in records.items():
+            label_values = {**(labels or {}), "work": work_name, "stage": record["stage"]}
+            lines.append(f"{name}{{{_format_labels(label_values)}}} {record[key]}")
+
+    name = "deepchecks_stage_phase_duration_seconds"
+    lines += [f"# HELP {name} Wall time of each phase of the last run of a stage.", f"# TYPE {name} gauge"]
+    for work_name, record in records.items():
+        for phase, duration in record["phases"].items():
+            label_values = {**(labels or {}), "work": work_name, "stage": record["stage"], "phase": phase}
+            lines.append(f"{name}{{{_format_labels(label_values)}}} {duration}")
+    return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    escaped = {key: str(value).replace("\\", "\\\\").replace('"', '\\"') for key, value in labels.items()}
+    return ",".join(f'{key}="{value}"' for key, value in escaped.items())
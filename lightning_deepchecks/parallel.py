@@ -0,0 +1,115 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional, Sequence, Tuple
+
+# The suite arguments of the current pool, sent once to every worker process instead of once per check.
+_WORKER_RUNS = None
+# Tabular checks which use the model itself rather than its predictions, they get the real model in the pool.
+MODEL_CHECKS = ("BoostingOverfit", "ModelInferenceTime")
+# The ``Suite.run`` arguments holding the outputs of a model, which its other checks run on instead of the model.
+OUTPUT_KWARGS = ("y_pred_train", "y_pred_test", "y_proba_train", "y_proba_test", "model_classes", "feature_importance")
+
+
+def available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _init_worker(runs: List[Tuple[Sequence, dict, Optional[dict]]]):
+    global _WORKER_RUNS
+    _WORKER_RUNS = runs
+
+
+def _check_call(check, args: Sequence, kwargs: dict, model_outputs: Optional[dict]) -> Tuple[Sequence, dict]:
+    """Returns the arguments of a run of ``check``: the precomputed model outputs instead of the model, unless the
+    check is listed in ``MODEL_CHECKS``."""
+    if model_outputs is None:
+        return args, kwargs
+    kwargs = {name: value for name, value in kwargs.items() if name not in OUTPUT_KWARGS}
+    if type(check).__name__ in MODEL_CHECKS:
+        return args, {**kwargs, "feature_importance": model_outputs["feature_importance"]}
+    return [*args[:2], None, *args[3:]], {**kwargs, **model_outputs}
+
+
+def _run_check(suite_cls, suite_name: str, run_index: int, check) -> list:
+    args, kwargs = _check_call(check, *_WORKER_RUNS[run_index])
+    return suite_cls(suite_name, check).run(*args, **kwargs).results
+
+
+def _model_outputs(args: Sequence, kwargs: dict, compute: bool = True) -> Optional[dict]:
+    """Returns the predictions and the feature importance of the model of a tabular suite run, shared by all its
+    checks, or ``None`` when the run has no model.
+
+    The outputs given in ``kwargs`` are used as they are, the missing ones are computed when ``compute`` is set.
+    """
+    from deepchecks.tabular import Dataset
+    from deepchecks.tabular.feature_importance import calculate_feature_importance
+
+    if len(args) < 3 or args[2] is None or not isinstance(args[0], Dataset):
+        return None
+    model = args[2]
+    outputs = {name: kwargs[name] for name in OUTPUT_KWARGS if kwargs.get(name) is not None}
+    if not any(name.startswith("y_") for name in outputs):
+        if not compute:
+            return None
+        for split, dataset in (("train", args[0]), ("test", args[1])):
+            outputs[f"y_pred_{split}"] = model.predict(dataset.features_columns)
+            if hasattr(model, "predict_proba"):
+                outputs[f"y_proba_{split}"] = model.predict_proba(dataset.features_columns)
+        if hasattr(model, "classes_"):
+            outputs["model_classes"] = list(model.classes_)
+    if outputs.get("feature_importance") is None:
+        outputs["feature_importance"] = calculate_feature_importance(model, args[0])
+    return outputs
+
+
+def _run_serial(suite, args: Sequence, kwargs: dict):
+    """Runs ``suite`` in this process. With a model and its precomputed outputs, the checks listed in
+    ``MODEL_CHECKS`` run on the model and the others on the outputs, each group sharing one context."""
+    from deepchecks.core.suite import SuiteResult
+
+    # A serial run builds a single context, the outputs are only worth splitting the suite when already computed.
+    model_outputs = _model_outputs(args, kwargs, compute=False)
+    if model_outputs is None:
+        return suite.run(*args, **kwargs)
+    checks = list(suite.checks.values())
+    groups = {}
+    for uses_model in (True, False):
+        group = [check for check in checks if (type(check).__name__ in MODEL_CHECKS) == uses_model]
+        if group:
+            group_args, group_kwargs = _check_call(group[0], args, kwargs, model_outputs)
+            groups[uses_model] = iter(type(suite)(suite.name, *group).run(*group_args, **group_kwargs).results)
+    # Every check has one result, merged back in the suite's check order.
+    results = [next(groups[type(check).__name__ in MODEL_CHECKS]) for check in checks]
+    return SuiteResult(suite.name, results)
+
+
+def run_suites(runs: List[Tuple[Any, Sequence]], max_workers: Optional[int] = None, **kwargs) -> list:
+    """Runs every ``(suite, args)`` pair and returns their ``SuiteResult`` in the same order.
+
+    The checks of all the suites are spread over a pool of ``max_workers`` processes, defaulting to the available
+    CPUs. Each check runs as a single-check suite, and its results are merged back in the suite's check order, so the
+    merged results match a serial ``suite.run(*args)``. Every check builds its own context, so the predictions and the
+    feature importance of a tabular model are computed once here, unless given in ``kwargs``, and handed to the checks
+    not listed in ``MODEL_CHECKS``. Those get the model itself.
+    """
+    from deepchecks.core.suite import SuiteResult
+
+    max_workers = max_workers or available_cpus()
+    if max_workers <= 1:
+        return [_run_serial(suite, args, kwargs) for suite, args in runs]
+
+    context = multiprocessing.get_context("spawn")
+    initargs = ([(args, kwargs, _model_outputs(args, kwargs)) for _, args in runs],)
+    with ProcessPoolExecutor(max_workers, mp_context=context, initializer=_init_worker, initargs=initargs) as pool:
+        futures = [
+            [pool.submit(_run_check, type(suite), suite.name, run_index, check) for check in suite.checks.values()]
+            for run_index, (suite, _) in enumerate(runs)
+        ]
+        return [
+            SuiteResult(suite.name, [result for future in suite_futures for result in future.result()])
+            for (suite, _), suite_futures in zip(runs, futures)
+        ]
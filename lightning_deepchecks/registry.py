@@ -0,0 +1,97 @@
+import importlib
+from typing import Dict, List
+
+# The deepchecks datasets supported by the apps, with the metadata the suites need to build a ``Dataset``.
+# Keeping it static spares the flows and the UI the deepchecks import, ``registry_from_deepchecks`` rebuilds it from
+# the installed deepchecks when it gets upgraded.
+REGISTRY = {
+    "tabular": {
+        "classification": {
+            "iris": {"target": "target", "cat_features": []},
+            "breast_cancer": {"target": "target", "cat_features": []},
+            "phishing": {"target": "target", "cat_features": ["ext"]},
+            "adult": {
+                "target": "income",
+                "cat_features": [
+                    "workclass",
+                    "education",
+                    "marital-status",
+                    "occupation",
+                    "relationship",
+                    "race",
+                    "sex",
+                    "native-country",
+                ],
+            },
+            "lending_club": {
+                "target": "loan_status",
+                "cat_features": [
+                    "addr_state",
+                    "application_type",
+                    "home_ownership",
+                    "initial_list_status",
+                    "purpose",
+                    "term",
+                    "verification_status",
+                    "sub_grade",
+                ],
+            },
+        },
+        "regression": {
+            "avocado": {"target": "AveragePrice", "cat_features": ["type", "region"]},
+            "wine_quality": {"target": "quality", "cat_features": []},
+        },
+    },
+    # Vision datasets are loaded as ``VisionData``, which carries its own labels.
+    "vision": {
+        "classification": {"mnist": {"target": None, "cat_features": []}},
+        "detection": {"coco": {"target": None, "cat_features": []}},
+    },
+}
+LOADERS = {"tabular": "load_data", "vision": "load_dataset"}
+
+
+def datasets(domain: str) -> Dict[str, List[str]]:
+    """Returns the names of the datasets of ``domain``, grouped by algorithm."""
+    if domain not in REGISTRY:
+        raise ValueError(f"{domain} is not supported. Supported domains are {list(REGISTRY)}")
+    return {algo: list(names) for algo, names in REGISTRY[domain].items()}
+
+
+def find_algo(domain: str, dataset: str) -> str:
+    for algo, names in datasets(domain).items():
+        if dataset in names:
+            return algo
+    raise ValueError(f"{dataset} is not supported. Supported {domain} datasets are {datasets(domain)}")
+
+
+def get_dataset(domain: str, algo: str, dataset: str) -> dict:
+    """Returns the registry entry of a dataset: its module, loader, target and categorical features."""
+    if dataset not in datasets(domain).get(algo, []):
+        raise ValueError(f"{domain}/{algo}/{dataset} is not supported. Supported datasets are {datasets(domain)}")
+    return {
+        "module": f"deepchecks.{domain}.datasets.{algo}.{dataset}",
+        "loader": LOADERS[domain],
+        **REGISTRY[domain][algo][dataset],
+    }
+
+
+def load_module(entry: dict):
+    """Imports the deepchecks module of a registry entry, only call it from the work running the dataset."""
+    return importlib.import_module(entry["module"])
+
+
+def registry_from_deepchecks() -> dict:
+    """Rebuilds ``REGISTRY`` from the installed deepchecks, to refresh the static copy after an upgrade."""
+    registry = {}
+    for domain, algos in REGISTRY.items():
+        registry[domain] = {}
+        for algo, names in algos.items():
+            registry[domain][algo] = {}
+            for dataset in names:
+                module = load_module(get_dataset(domain, algo, dataset))
+                registry[domain][algo][dataset] = {
+                    "target": getattr(module, "_target", None) if domain == "tabular" else None,
+                    "cat_features": list(getattr(module, "_CAT_FEATURES", [])) if domain == "tabular" else [],
+                }
+    return registry
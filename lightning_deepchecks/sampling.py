@@ -0,0 +1,88 @@
+from typing import List, Optional, Tuple
+
+# Defaults of the sampling options of a ``GetDataWork``.
+SAMPLING_DEFAULTS = {
+    "seed": 0,
+    "time_budget_s": None,
+    "memory_budget_bytes": None,
+    # Rows checked per second by the suites, until measured on a previous run.
+    "rows_per_second": 20_000,
+    "min_rows": 10_000,
+    # Rows kept for every category of every categorical feature, so that rare categories stay visible to the checks.
+    "min_per_category": 5,
+}
+# The suites hold about two copies of their data, the frame and the deepchecks ``Dataset``.
+MEMORY_COPIES = 2
+
+
+def sampling_options(options: Optional[dict]) -> dict:
+    unknown = set(options or {}) - set(SAMPLING_DEFAULTS)
+    if unknown:
+        raise ValueError(f"{sorted(unknown)} are not supported. Supported sampling options are {SAMPLING_DEFAULTS}")
+    return {**SAMPLING_DEFAULTS, **(options or {})}
+
+
+def plan_sample_size(rows: int, bytes_per_row: float, options: dict) -> Tuple[int, str]:
+    """Returns the number of rows fitting the time and memory budgets of ``options``, and the binding constraint."""
+    limits = {"rows": rows}
+    if options["time_budget_s"] is not None:
+        limits["time_budget"] = int(options["time_budget_s"] * options["rows_per_second"])
+    if options["memory_budget_bytes"] is not None:
+        limits["memory_budget"] = int(options["memory_budget_bytes"] / max(bytes_per_row * MEMORY_COPIES, 1))
+    bound = min(limits, key=limits.get)
+    n_rows = max(limits[bound], options["min_rows"])
+    # Rounded down to two significant digits, so that small changes of the measured throughput keep the same sample.
+    step = 10 ** max(len(str(n_rows)) - 2, 0)
+    return min(rows, n_rows // step * step), bound
+
+
+def stratified_sample(
+    df,
+    n_rows: int,
+    label: Optional[str],
+    cat_features: List[str],
+    seed: int = 0,
+    min_per_category: int = 5,
+):
+    """Returns a deterministic sample of about ``n_rows`` rows of ``df``, stratified on ``label``.
+
+    Rows are ranked by a seeded hash of their index, so the same seed always draws the same rows and a larger sample
+    contains the smaller ones. Every label keeps its share of the sample, and every category of ``cat_features`` keeps
+    at least ``min_per_category`` rows.
+    """
+    import pandas as pd
+
+    if n_rows >= len(df):
+        return df
+    keys = pd.Series(
+        pd.util.hash_pandas_object(df.index.to_series(), index=False, hash_key=f"{seed:016d}"[-16:]).to_numpy(),
+        index=df.index,
+    )
+    fraction = n_rows / len(df)
+    if label is not None and label in df.columns:
+        strata = df[label].astype(str)
+        quotas = (strata.value_counts() * fraction).round().clip(lower=1)
+        selected = keys.groupby(strata).rank(method="first") <= strata.map(quotas)
+    else:
+        selected = keys.rank(method="first") <= n_rows
+    for name in cat_features:
+        if name in df.columns:
+            selected |= keys.groupby(df[name].astype(str)).rank(method="first") <= min_per_category
+    return df[selected.to_numpy()]
+
+
+def sample_frame(df, label: Optional[str], cat_features: List[str], options: dict):
+    """Samples ``df`` within the budgets of ``options`` and returns the sample with the parameters used."""
+    rows = len(df)
+    bytes_per_row = int(df.memory_usage(deep=True).sum()) / max(rows, 1)
+    n_rows, bound = plan_sample_size(rows, bytes_per_row, options)
+    sample = stratified_sample(df, n_rows, label, cat_features, options["seed"], options["min_per_category"])
+    return sample, {
+        "rows": rows,
+        "sample_rows": len(sample),
+        "fraction": round(len(sample) / max(rows, 1), 6),
+        "bound": bound,
+        "seed": options["seed"],
+        "rows_per_second": options["rows_per_second"],
+        "strata": [name for name in [label, *cat_features] if name in df.columns],
+    }
@@ -1,44 +1,248 @@
+import importlib
 import os
+import shutil
 from datetime import datetime
+from typing import List, Optional, Tuple, Union
 
 import lightning as L
-from deepchecks.tabular import Dataset
-from deepchecks.tabular.datasets.classification import adult
-from deepchecks.tabular.datasets.classification.adult import _CAT_FEATURES, _target, load_fitted_model
-from deepchecks.tabular.suites import data_integrity, model_evaluation, train_test_validation
 from lightning.app.storage import Path, Payload
 
+from lightning_deepchecks.cache import DatasetCache, ResultCache, fingerprint
+from lightning_deepchecks.chunked import chunked_integrity
+from lightning_deepchecks.conditions import (
+    BLOCKING_SEVERITIES,
+    SEVERITIES,
+    run_fail_fast,
+    stopping_check,
+    worst_status,
+)
+from lightning_deepchecks.drift import DriftMonitor
+from lightning_deepchecks.handoff import HANDOFF_MODES, hand_off, read_frame
+from lightning_deepchecks.history import RunHistory, flatten_values, summarize_suite_result
+from lightning_deepchecks.metrics import RunMetrics
+from lightning_deepchecks.parallel import run_suites
+from lightning_deepchecks.registry import find_algo, get_dataset, load_module
+from lightning_deepchecks.sampling import sample_frame, sampling_options
+
+# deepchecks is only imported by the works, when they run.
+_ADULT = get_dataset("tabular", "classification", "adult")
+WORKER_SUITES = ("data_integrity", "train_test_validation", "model_evaluation")
+
+
+def _tabular_dataset(name: str) -> dict:
+    return get_dataset("tabular", find_algo("tabular", name), name)
+
+
+def _read_data_frame(data: Union[Payload, Path]):
+    from deepchecks.tabular import Dataset
+
+    value = read_frame(data)
+    return value.data if isinstance(value, Dataset) else value
+
+
+def _report_size(*paths: str) -> int:
+    return sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+
+
+def _run_cached_suites(
+    cache: ResultCache,
+    suite_name: str,
+    jobs: List[Tuple[str, List]],
+    metrics: RunMetrics,
+    model=None,
+    check_workers: Optional[int] = 1,
+    history: Optional[RunHistory] = None,
+    history_names: Optional[List[str]] = None,
+    run_id: Optional[str] = None,
+    blocking_checks: Optional[List[str]] = None,
+    blocking_severity: str = "fail",
+    dataset: str = "adult",
+) -> list:
+    """Runs the tabular suite ``suite_name`` once per ``(report_path, dfs)`` job and saves its reports, reusing the
+    cached results of identical inputs.
+
+    The checks of the remaining runs are spread over ``check_workers`` processes, ``None`` uses all the available CPUs.
+    Every job is then indexed in ``history`` under its name in ``history_names``, defaulting to ``suite_name``.
+    With ``blocking_checks``, a run stops at the first of them whose conditions reach ``blocking_severity``.
+    """
+    from deepchecks.tabular import Dataset
+
+    entry = _tabular_dataset(dataset)
+
+    suite = getattr(importlib.import_module("deepchecks.tabular.suites"), suite_name)
+    model_fingerprint = fingerprint(model) if model is not None else None
+    results, misses, data_fingerprints = [None] * len(jobs), [], []
+    for index, (report_path, dfs) in enumerate(jobs):
+        data_fingerprints.append(fingerprint(*[df.data if isinstance(df, Dataset) else df for df in dfs]))
+        # A suite stopped early is not the same result as a complete one.
+        policy = [blocking_checks, blocking_severity] if blocking_checks else []
+        key = cache.key(suite_name, data_fingerprints[-1], model_fingerprint, *policy)
+        cached = cache.load(key)
+        if cached is None:
+            misses.append((index, key))
+            continue
+        results[index], cached_report_path = cached
+        shutil.copyfile(cached_report_path, report_path)
+        print(f"Reusing cached {suite_name} results.")
+
+    runs = []
+    label, cat_features = entry["target"], entry["cat_features"]
+    with metrics.phase("dataset"):
+        for index, _ in misses:
+            datasets = [
+                df if isinstance(df, Dataset) else Dataset(df, label=label, cat_features=cat_features)
+                for df in jobs[index][1]
+            ]
+            runs.append((suite(), datasets if model is None else [*datasets, model]))
+
+    with metrics.phase("checks"):
+        if blocking_checks:
+            suite_results = [
+                run_fail_fast(suite, args, blocking_checks, blocking_severity, max_workers=check_workers)
+                for suite, args in runs
+            ]
+        else:
+            suite_results = run_suites(runs, max_workers=check_workers)
+
+    with metrics.phase("render"):
+        for (index, key), result in zip(misses, suite_results):
+            report_path = jobs[index][0]
+            result.save_as_html(report_path)
+            cache.save(key, result, report_path)
+            results[index] = result
+
+    if history is not None:
+        with metrics.phase("history"):
+            for name, (report_path, _), result, data_fingerprint in zip(
+                history_names or [suite_name] * len(jobs), jobs, results, data_fingerprints
+            ):
+                history.record(
+                    dataset,
+                    name,
+                    summarize_suite_result(result),
+                    run_id=run_id,
+                    report_path=report_path,
+                    data_fingerprint=data_fingerprint,
+                    model_fingerprint=model_fingerprint,
+                )
+            history.compact()
+
+    metrics.cache_hits, metrics.cache_misses = cache.hits, cache.misses
+    return results
+
 
 class GetDataWork(L.LightningWork):
-    """This component is responsible to download some data and store them with a PayLoad."""
+    """This component is responsible to download some data and store them with a PayLoad.
+
+    With ``sampling`` options, the data is first reduced to a seeded sample stratified on the label and the categorical
+    features, sized to fit a time or a memory budget. Every suite then checks the same sample, whose parameters are
+    recorded in ``sampling``.
+    """
 
-    def __init__(self):
+    def __init__(
+        self,
+        handoff: str = "payload",
+        dataset_cache_dir: Optional[str] = None,
+        max_dataset_cache_size: int = 5 * 1024**3,
+        sampling: Optional[dict] = None,
+    ):
         super().__init__()
+        if handoff not in HANDOFF_MODES:
+            raise ValueError(f"{handoff} is not supported. Supported handoff modes are {HANDOFF_MODES}")
+        self.handoff = handoff
+        self.dataset_cache_dir = dataset_cache_dir
+        self.max_dataset_cache_size = max_dataset_cache_size
+        self.sampling_options = sampling_options(sampling) if sampling is not None else None
         self.df_train = None
         self.df_test = None
+        self.memory_usage = None
+        self.sampling = None
+        self.metrics = None
 
-    def run(self):
+    def run(self, run_id: Optional[str] = None, rows_per_second: Optional[float] = None):
+        """Collects the data, ``rows_per_second`` is the suites throughput measured on the previous run, which sizes
+        the sample of a time budget."""
+        # ``run_id`` only makes every scheduled run a new call, so a reused work collects the data again.
         print("Starting data collection...")
-        df_train, df_test = adult.load_data(data_format="Dataframe")
-        self.df_train = Payload(df_train)
-        self.df_test = Payload(df_test)
+        metrics = RunMetrics("get_data")
+        cache = DatasetCache(self.dataset_cache_dir, self.max_dataset_cache_size)
+        with metrics.phase("fetch"):
+            df_train, df_test = cache.fetch(
+                cache.key("tabular", "classification", "adult"),
+                lambda: load_module(_ADULT).load_data(data_format="Dataframe"),
+            )
+        metrics.cache_hits, metrics.cache_misses = cache.hits, cache.misses
+
+        if self.sampling_options is not None:
+            with metrics.phase("sample"):
+                df_train, df_test = self._sample(df_train, df_test, rows_per_second)
+
+        with metrics.phase("handoff"):
+            self._handoff(df_train, df_test)
+
+        self.metrics = metrics.finish()
         print("Finished data collection.")
 
+    def _sample(self, df_train, df_test, rows_per_second: Optional[float] = None):
+        options = dict(self.sampling_options)
+        if rows_per_second:
+            options["rows_per_second"] = rows_per_second
+        label, cat_features = _ADULT["target"], _ADULT["cat_features"]
+        df_train, train_sampling = sample_frame(df_train, label, cat_features, options)
+        df_test, test_sampling = sample_frame(df_test, label, cat_features, options)
+        self.sampling = {"train": train_sampling, "test": test_sampling}
+        print(f"Sampled {train_sampling['sample_rows']} train and {test_sampling['sample_rows']} test rows.")
+        return df_train, df_test
+
+    def _handoff(self, df_train, df_test):
+        self.df_train, self.df_test, self.memory_usage = hand_off(
+            df_train, df_test, self.handoff, self.name, _ADULT["target"], _ADULT["cat_features"]
+        )
+
 
 class DataIntegrityCheck(L.LightningWork):
-    def __init__(self):
-        super().__init__()
+    """Runs the data integrity suite on the train and test sets.
+
+    With ``chunk_rows``, the sets are streamed in chunks of that many rows instead, and only the statistics that can be
+    aggregated across chunks are reported. The inputs may then also be paths to Parquet or CSV files larger than memory.
+    ``dataset`` names the registered tabular dataset the sets belong to, which gives their label and categorical
+    features.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_cache_size: int = 2 * 1024**3,
+        parallel: bool = False,
+        check_workers: Optional[int] = 1,
+        history_path: Optional[str] = None,
+        chunk_rows: Optional[int] = None,
+        dataset: str = "adult",
+    ):
+        super().__init__(parallel=parallel)
+        # Rejects an unknown dataset when the DAG is built rather than on its first run.
+        _tabular_dataset(dataset)
         self.dir_path = "suite_results"
+        self.cache_dir = cache_dir
+        self.max_cache_size = max_cache_size
+        self.check_workers = check_workers
+        self.history_path = history_path
+        self.chunk_rows = chunk_rows
+        self.dataset = dataset
         self.train_results_path = None
         self.test_results_path = None
+        # The most severe condition status of the last run, which the DAG uses to skip the next stages.
+        self.condition_status = None
+        self.metrics = None
 
-    def run(self, df_train: Payload, df_test: Payload):
+    def run(
+        self,
+        df_train: Union[Payload, Path, str],
+        df_test: Union[Payload, Path, str],
+        run_id: Optional[str] = None,
+    ):
         print("Starting Data Integrity Check....")
-        df_train = Dataset(df_train.value, label=_target, cat_features=_CAT_FEATURES)
-        df_test = Dataset(df_test.value, label=_target, cat_features=_CAT_FEATURES)
-
-        train_results = data_integrity().run(df_train)
-        test_results = data_integrity().run(df_test)
+        metrics = RunMetrics("data_integrity", df_train, df_test)
 
         os.makedirs(self.dir_path, exist_ok=True)
 
@@ -46,58 +250,348 @@ class DataIntegrityCheck(L.LightningWork):
         train_results_path = os.path.join(self.dir_path, f"train_integrity_{run_time}.html")
         test_results_path = os.path.join(self.dir_path, f"test_integrity_{run_time}.html")
 
-        train_results.save_as_html(train_results_path)
-        test_results.save_as_html(test_results_path)
+        if self.chunk_rows:
+            with metrics.phase("chunks"):
+                self._run_chunked([(train_results_path, df_train), (test_results_path, df_test)], run_id)
+            self._finish(train_results_path, test_results_path, metrics)
+            return
+
+        cache = ResultCache(self.cache_dir, self.max_cache_size)
+        with metrics.phase("load"):
+            df_train, df_test = read_frame(df_train), read_frame(df_test)
+
+        # The train and test passes share the same pool of check workers.
+        results = _run_cached_suites(
+            cache,
+            "data_integrity",
+            [(train_results_path, [df_train]), (test_results_path, [df_test])],
+            metrics,
+            check_workers=self.check_workers,
+            history=RunHistory(self.history_path),
+            history_names=["train_integrity", "test_integrity"],
+            run_id=run_id,
+            dataset=self.dataset,
+        )
 
+        self.condition_status = worst_status(results)
+        self._finish(train_results_path, test_results_path, metrics)
+
+    def _run_chunked(self, jobs: List[Tuple[str, Union[Payload, Path, str]]], run_id: Optional[str] = None):
+        history = RunHistory(self.history_path)
+        statuses = []
+        entry = _tabular_dataset(self.dataset)
+        for name, (report_path, source) in zip(["train_integrity", "test_integrity"], jobs):
+            stats = chunked_integrity(source, entry["target"], entry["cat_features"], self.chunk_rows)
+            checks = stats.checks()
+            stats.save_as_html(report_path, checks)
+            statuses.append(stats.status(checks))
+            history.record(
+                self.dataset,
+                name,
+                checks,
+                run_id=run_id,
+                report_path=report_path,
+                data_fingerprint=stats.fingerprint,
+            )
+        history.compact()
+        self.condition_status = max(statuses, key=SEVERITIES.get)
+
+    def _finish(self, train_results_path: str, test_results_path: str, metrics: RunMetrics):
         self.train_results_path = Path(train_results_path)
         self.test_results_path = Path(test_results_path)
+        self.metrics = metrics.finish(_report_size(train_results_path, test_results_path))
         print("Finished data integrity check.")
 
 
 class TrainTestValidation(L.LightningWork):
-    def __init__(self):
-        super().__init__()
+    """Runs the train test validation suite, or with ``incremental=True`` only scores the drift of the test window
+    against persisted sketches of the train set.
+
+    With ``blocking_checks``, the suite runs them first and stops at the first one whose conditions reach
+    ``blocking_severity``, recording its header in ``stopped_at``.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_cache_size: int = 2 * 1024**3,
+        parallel: bool = False,
+        check_workers: Optional[int] = 1,
+        incremental: bool = False,
+        sketch_dir: Optional[str] = None,
+        history_path: Optional[str] = None,
+        blocking_checks: Optional[List[str]] = None,
+        blocking_severity: str = "fail",
+    ):
+        super().__init__(parallel=parallel)
+        if blocking_severity not in BLOCKING_SEVERITIES:
+            raise ValueError(f"{blocking_severity} is not supported. Supported severities are {BLOCKING_SEVERITIES}")
         self.dir_path = "suite_results"
+        self.cache_dir = cache_dir
+        self.max_cache_size = max_cache_size
+        self.check_workers = check_workers
+        self.history_path = history_path
+        self.incremental = incremental
+        self.sketch_dir = sketch_dir
+        self.blocking_checks = blocking_checks or []
+        self.blocking_severity = blocking_severity
+        self.stopped_at = None
         self.train_test_validation_results_path = None
+        self.drift_scores = {}
+        self.metrics = None
 
-    def run(self, df_train: Payload, df_test: Payload):
+    def run(self, df_train: Union[Payload, Path], df_test: Union[Payload, Path], run_id: Optional[str] = None):
         print("Starting train test validation suite...")
-        df_train = Dataset(df_train.value, label=_target, cat_features=_CAT_FEATURES)
-        df_test = Dataset(df_test.value, label=_target, cat_features=_CAT_FEATURES)
-
-        train_test_validation_results = train_test_validation().run(df_train, df_test)
-
+        metrics = RunMetrics("train_test_validation", df_train, df_test)
+        self.stopped_at = None
         os.makedirs(self.dir_path, exist_ok=True)
 
         run_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         train_test_validation_results_path = os.path.join(self.dir_path, f"train_test_validation_{run_time}.html")
 
-        train_test_validation_results.save_as_html(train_test_validation_results_path)
+        if self.incremental:
+            with metrics.phase("sketch"):
+                self._run_incremental(df_train, df_test, train_test_validation_results_path, run_id)
+        else:
+            cache = ResultCache(self.cache_dir, self.max_cache_size)
+            with metrics.phase("load"):
+                df_train, df_test = read_frame(df_train), read_frame(df_test)
+            (result,) = _run_cached_suites(
+                cache,
+                "train_test_validation",
+                [(train_test_validation_results_path, [df_train, df_test])],
+                metrics,
+                check_workers=self.check_workers,
+                history=RunHistory(self.history_path),
+                run_id=run_id,
+                blocking_checks=self.blocking_checks,
+                blocking_severity=self.blocking_severity,
+            )
+            if self.blocking_checks:
+                self.stopped_at = stopping_check(result, self.blocking_checks, self.blocking_severity)
+                if self.stopped_at:
+                    print(f"Stopped the train test validation suite at the failing check {self.stopped_at}.")
 
         self.train_test_validation_results_path = Path(train_test_validation_results_path)
+        self.metrics = metrics.finish(_report_size(train_test_validation_results_path))
         print("Finished train test validation suite.")
 
+    def _run_incremental(
+        self,
+        df_train: Union[Payload, Path],
+        df_test: Union[Payload, Path],
+        results_path: str,
+        run_id: Optional[str] = None,
+    ):
+        import deepchecks
+        import pandas as pd
+
+        monitor = DriftMonitor(f"adult-{deepchecks.__version__}", self.sketch_dir)
+        df_train = _read_data_frame(df_train)
+        if not monitor.is_reference(df_train):
+            # The train set is only sketched on the first run and whenever it changes, the history restarts with it.
+            monitor.set_reference(df_train, _ADULT["target"], _ADULT["cat_features"])
+        scores = monitor.observe(_read_data_frame(df_test))
+        monitor.save()
+
+        self.drift_scores = {feature: round(score["drift_score"], 4) for feature, score in scores["window"].items()}
+
+        report = pd.concat(
+            {scope: pd.DataFrame.from_dict(scope_scores, orient="index") for scope, scope_scores in scores.items()},
+            axis=1,
+        )
+        with open(results_path, "w", encoding="utf-8") as f:
+            f.write(f"<h1>Train Test Drift</h1><p>{monitor.cumulative.rows} rows observed so far.</p>")
+            f.write(report.to_html(float_format="{:.4f}".format))
+
+        history = RunHistory(self.history_path)
+        history.record(
+            "adult",
+            "train_test_validation",
+            {"Train Test Drift": {"status": "no_conditions", "metrics": flatten_values(scores["window"])}},
+            run_id=run_id,
+            report_path=results_path,
+        )
+        history.compact()
+
 
 class ModelEvaluation(L.LightningWork):
-    def __init__(self):
-        super().__init__()
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_cache_size: int = 2 * 1024**3,
+        parallel: bool = False,
+        check_workers: Optional[int] = 1,
+        history_path: Optional[str] = None,
+    ):
+        super().__init__(parallel=parallel)
         self.dir_path = "suite_results"
+        self.cache_dir = cache_dir
+        self.max_cache_size = max_cache_size
+        self.check_workers = check_workers
+        self.history_path = history_path
         self.evaluation_results_path = None
+        self.metrics = None
 
-    def run(self, df_train: Payload, df_test: Payload):
+    def run(self, df_train: Union[Payload, Path], df_test: Union[Payload, Path], run_id: Optional[str] = None):
         print("Starting model evaluation...")
-        model = load_fitted_model()
-
-        df_train = Dataset(df_train.value, label=_target, cat_features=_CAT_FEATURES)
-        df_test = Dataset(df_test.value, label=_target, cat_features=_CAT_FEATURES)
-
-        evaluation_results = model_evaluation().run(df_train, df_test, model)
+        metrics = RunMetrics("model_evaluation", df_train, df_test)
+        cache = ResultCache(self.cache_dir, self.max_cache_size)
+        with metrics.phase("load"):
+            model = load_module(_ADULT).load_fitted_model()
+            df_train, df_test = read_frame(df_train), read_frame(df_test)
 
         os.makedirs(self.dir_path, exist_ok=True)
 
         run_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         evaluation_results_path = os.path.join(self.dir_path, f"model_evaluation_{run_time}.html")
 
-        evaluation_results.save_as_html(evaluation_results_path)
+        _run_cached_suites(
+            cache,
+            "model_evaluation",
+            [(evaluation_results_path, [df_train, df_test])],
+            metrics,
+            model=model,
+            check_workers=self.check_workers,
+            history=RunHistory(self.history_path),
+            run_id=run_id,
+        )
+
         self.evaluation_results_path = Path(evaluation_results_path)
+        self.metrics = metrics.finish(_report_size(evaluation_results_path))
         print("Finished model evaluation.")
+
+
+class SuiteWorker(L.LightningWork):
+    """A resident work running a stream of suite jobs, one per ``run`` call, in the same warm process.
+
+    deepchecks stays imported between jobs and the fitted models and fetched datasets are kept in memory, so a job only
+    pays for its checks. Every job reports its status, reports and condition status in ``results`` under its job id,
+    bounded by ``max_results``. A failing job is recorded as such and the worker keeps serving the next ones.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_cache_size: int = 2 * 1024**3,
+        check_workers: Optional[int] = 1,
+        history_path: Optional[str] = None,
+        dataset_cache_dir: Optional[str] = None,
+        max_dataset_cache_size: int = 5 * 1024**3,
+        max_results: int = 100,
+    ):
+        super().__init__(parallel=True)
+        self.dir_path = "suite_results"
+        self.cache_dir = cache_dir
+        self.max_cache_size = max_cache_size
+        self.check_workers = check_workers
+        self.history_path = history_path
+        self.dataset_cache_dir = dataset_cache_dir
+        self.max_dataset_cache_size = max_dataset_cache_size
+        self.max_results = max_results
+        self.results = {}
+        self.metrics = None
+        # Private attributes aren't part of the state, the models and datasets stay in this process across jobs.
+        self._models = {}
+        self._datasets = {}
+
+    def run(
+        self,
+        job_id: str,
+        suite: str,
+        df_train: Optional[Union[Payload, Path]] = None,
+        df_test: Optional[Union[Payload, Path]] = None,
+        dataset: str = "adult",
+        options: Optional[dict] = None,
+        run_id: Optional[str] = None,
+    ):
+        """Runs the job ``job_id``, on the handed off data or else on the fetched ``dataset``.
+
+        ``options`` may set the ``check_workers``, ``blocking_checks`` and ``blocking_severity`` of the job.
+        """
+        print(f"Starting the {suite} job {job_id}...")
+        metrics = RunMetrics(suite, *[data for data in (df_train, df_test) if data is not None])
+        try:
+            record = self._run_job(suite, dataset, df_train, df_test, options or {}, metrics, run_id)
+        except Exception as e:
+            print(f"The {suite} job {job_id} failed: {e!r}")
+            record = {"status": "failed", "error": repr(e)}
+        self.metrics = metrics.finish(_report_size(*record.get("reports", {}).values()))
+        record.update(
+            suite=suite,
+            dataset=dataset,
+            duration_s=self.metrics["duration_s"],
+            cache_hits=self.metrics["cache_hits"],
+        )
+        self.results = dict([*self.results.items(), (job_id, record)][-self.max_results :])
+        print(f"Finished the {suite} job {job_id}.")
+
+    def _run_job(
+        self,
+        suite: str,
+        dataset: str,
+        df_train: Optional[Union[Payload, Path]],
+        df_test: Optional[Union[Payload, Path]],
+        options: dict,
+        metrics: RunMetrics,
+        run_id: Optional[str],
+    ) -> dict:
+        if suite not in WORKER_SUITES:
+            raise ValueError(f"{suite} is not supported. Supported suites are {WORKER_SUITES}")
+        with metrics.phase("load"):
+            if df_train is None or df_test is None:
+                df_train, df_test = self._dataset(dataset)
+            else:
+                df_train, df_test = read_frame(df_train), read_frame(df_test)
+        model = None
+        if suite == "model_evaluation":
+            with metrics.phase("load_model"):
+                model = self._model(dataset)
+
+        os.makedirs(self.dir_path, exist_ok=True)
+        run_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        if suite == "data_integrity":
+            names, dfs = ["train_integrity", "test_integrity"], [[df_train], [df_test]]
+        else:
+            names, dfs = [suite], [[df_train, df_test]]
+        reports = {name: os.path.join(self.dir_path, f"{dataset}_{name}_{run_time}.html") for name in names}
+
+        blocking_checks = options.get("blocking_checks") if suite == "train_test_validation" else None
+        blocking_severity = options.get("blocking_severity", "fail")
+        results = _run_cached_suites(
+            ResultCache(self.cache_dir, self.max_cache_size),
+            suite,
+            list(zip(reports.values(), dfs)),
+            metrics,
+            model=model,
+            check_workers=options.get("check_workers", self.check_workers),
+            history=RunHistory(self.history_path),
+            history_names=names,
+            run_id=run_id,
+            blocking_checks=blocking_checks,
+            blocking_severity=blocking_severity,
+            dataset=dataset,
+        )
+        record = {"status": "succeeded", "reports": reports, "condition_status": worst_status(results)}
+        if blocking_checks:
+            record["stopped_at"] = stopping_check(results[0], blocking_checks, blocking_severity)
+        return record
+
+    def _dataset(self, dataset: str):
+        if dataset in self._datasets:
+            return self._datasets[dataset]
+        entry = _tabular_dataset(dataset)
+        cache = DatasetCache(self.dataset_cache_dir, self.max_dataset_cache_size)
+        self._datasets[dataset] = cache.fetch(
+            cache.key("tabular", find_algo("tabular", dataset), dataset),
+            lambda: getattr(load_module(entry), entry["loader"])(data_format="Dataframe"),
+        )
+        return self._datasets[dataset]
+
+    def _model(self, dataset: str):
+        import deepchecks
+
+        key = (dataset, deepchecks.__version__)
+        if key not in self._models:
+            self._models[key] = load_module(_tabular_dataset(dataset)).load_fitted_model()
+        return self._models[key]
@@ -0,0 +1,82 @@
+import json
+import os
+from typing import Dict, List, Optional
+
+from lightning_deepchecks.registry import datasets, find_algo
+
+# Relative cost of running the suites of a tabular dataset, the ones not listed weigh 1.
+DATASET_WEIGHTS = {"lending_club": 4, "adult": 2}
+
+
+def sweep_configs(suites: List[str], dataset_names: Optional[List[str]] = None) -> List[dict]:
+    """Returns the job config of every requested dataset, all the registered ones by default."""
+    configs = []
+    for domain in ("tabular", "vision"):
+        for names in datasets(domain).values():
+            for dataset in names:
+                if dataset_names is None or dataset in dataset_names:
+                    algo = find_algo(domain, dataset)
+                    configs.append({"domain": domain, "algo": algo, "dataset": dataset, "suites": list(suites)})
+    unknown = set(dataset_names or []) - {config["dataset"] for config in configs}
+    if unknown:
+        supported = {domain: datasets(domain) for domain in ("tabular", "vision")}
+        raise ValueError(f"{sorted(unknown)} are not supported. Supported datasets are {supported}")
+    return configs
+
+
+def plan_batches(configs: List[dict], batch_capacity: int = 4) -> List[dict]:
+    """Groups the job configs into batches, each run in order by a single runner.
+
+    Vision jobs are heavy and get a batch of their own. Tabular jobs are packed first fit decreasing by their weight,
+    up to ``batch_capacity`` per batch, so that the small datasets share warm runners.
+    """
+    batches = [{"heavy": True, "configs": [config]} for config in configs if config["domain"] == "vision"]
+    tabular = sorted(
+        (config for config in configs if config["domain"] != "vision"),
+        key=lambda config: DATASET_WEIGHTS.get(config["dataset"], 1),
+        reverse=True,
+    )
+    loads = []
+    light_batches = []
+    for config in tabular:
+        weight = DATASET_WEIGHTS.get(config["dataset"], 1)
+        index = next((i for i, load in enumerate(loads) if load + weight <= batch_capacity), None)
+        if index is None:
+            loads.append(0)
+            light_batches.append({"heavy": False, "configs": []})
+            index = len(loads) - 1
+        loads[index] += weight
+        light_batches[index]["configs"].append(config)
+    # The heavy batches start first, they bound the duration of the sweep.
+    return batches + light_batches
+
+
+def summarize_sweep(results: Dict[str, dict]) -> List[dict]:
+    """Returns one row per dataset and suite with the number of checks per status.
+
+    ``results`` maps every dataset to its ``status`` and the report descriptors of its suites.
+    """
+    from lightning_deepchecks.artifacts import load_report
+    from lightning_deepchecks.viewer import STATUSES, parse_suite_json
+
+    rows = []
+    for dataset, result in results.items():
+        for suite, reports in result.get("reports", {}).items():
+            row = {"dataset": dataset, "suite": suite, "status": result["status"]}
+            row.update({status: 0 for status in STATUSES})
+            if reports.get("report_json") is not None:
+                checks = parse_suite_json(load_report(reports["report_json"]))["checks"]
+                for check in checks:
+                    row[check["status"]] += 1
+                row["failing checks"] = [check["header"] for check in checks if check["status"] == "Failed"]
+            rows.append(row)
+    return rows
+
+
+def save_summary(rows: List[dict], path: str) -> str:
+    """Writes the sweep summary as JSON lines and returns its path."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+    return path
@@ -0,0 +1,92 @@
+import base64
+import html
+import json
+from typing import List
+
+STATUSES = ("Failed", "Error", "Warning", "Passed", "No conditions")
+
+
+def parse_suite_json(text: str) -> dict:
+    """Reads the output of ``SuiteResult.to_json`` into a suite name and the list of its checks.
+
+    Every check keeps its position in the suite, a status derived from its conditions and its raw displays, which are
+    only rendered on demand by ``render_check``.
+    """
+    data = json.loads(text)
+    checks = []
+    for index, result in enumerate(data.get("results", [])):
+        result = json.loads(result) if isinstance(result, str) else result
+        check = result.get("check") or {}
+        conditions = result.get("conditions_results") or []
+        checks.append(
+            {
+                "index": index,
+                "header": result.get("header") or check.get("name", f"Check {index}"),
+                "summary": check.get("summary", ""),
+                "status": _status(result, conditions),
+                "conditions": conditions,
+                "display": result.get("display") or [],
+                "exception": result.get("exception"),
+            }
+        )
+    return {"name": data.get("name", ""), "checks": checks}
+
+
+def _status(result: dict, conditions: List[dict]) -> str:
+    if result.get("type") == "CheckFailure":
+        return "Error"
+    statuses = " ".join(str(condition.get("Status", "")).lower() for condition in conditions)
+    for keyword, status in (("fail", "Failed"), ("error", "Error"), ("warn", "Warning"), ("pass", "Passed")):
+        if keyword in statuses:
+            return status
+    return "No conditions"
+
+
+def summary_rows(suite: dict) -> List[dict]:
+    """Returns one row per check, the failing checks first."""
+    checks = sorted(suite["checks"], key=lambda check: (STATUSES.index(check["status"]), check["index"]))
+    return [
+        {"check": check["header"], "status": check["status"], "conditions": len(check["conditions"])}
+        for check in checks
+    ]
+
+
+def render_check(check: dict) -> str:
+    """Renders the HTML fragment of a single check: its summary, its conditions and its displays."""
+    parts = [f"<h3>{html.escape(check['header'])}</h3>"]
+    if check["summary"]:
+        parts.append(f"<p>{check['summary']}</p>")
+    if check["exception"]:
+        parts.append(f"<pre>{html.escape(str(check['exception']))}</pre>")
+    if check["conditions"]:
+        parts.append(_table(check["conditions"]))
+    for display in check["display"]:
+        parts.append(_render_display(display))
+    return "\n".join(parts)
+
+
+def _render_display(display: dict) -> str:
+    kind, payload = display.get("type"), display.get("payload")
+    if kind == "html":
+        return payload
+    if kind == "dataframe":
+        return _table(payload)
+    if kind == "plotly":
+        import plotly.io
+
+        figure = plotly.io.from_json(payload if isinstance(payload, str) else json.dumps(payload))
+        return figure.to_html(full_html=False, include_plotlyjs="cdn")
+    if kind in ("plt", "image", "images"):
+        images = payload if isinstance(payload, list) else [payload]
+        return "".join(f'<img src="data:image/png;base64,{_base64(image)}"/>' for image in images)
+    return f"<p><i>{html.escape(str(kind))} output is only available in the full report.</i></p>"
+
+
+def _base64(image) -> str:
+    return image if isinstance(image, str) else base64.b64encode(image).decode("ascii")
+
+
+def _table(records) -> str:
+    import pandas as pd
+
+    return pd.DataFrame(records).to_html(index=False, escape=False, border=0)
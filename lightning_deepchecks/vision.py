@@ -0,0 +1,45 @@
+import inspect
+from typing import Optional
+
+from lightning_deepchecks.registry import get_dataset, load_module
+
+# Options of the data loaders built by every suite work, ``n_samples=None`` streams the whole split.
+DEFAULT_LOADER_OPTIONS = {"batch_size": 64, "num_workers": 0, "n_samples": None, "pin_memory": False}
+
+
+def vision_reference(config: dict, train: bool, loader_options: Optional[dict] = None) -> dict:
+    """Returns a reference to a split of a deepchecks vision dataset, small enough to live in the work state."""
+    unknown = set(loader_options or {}) - set(DEFAULT_LOADER_OPTIONS)
+    if unknown:
+        raise ValueError(f"{sorted(unknown)} are not supported. Supported loader options are {DEFAULT_LOADER_OPTIONS}")
+    return {
+        "domain": config["domain"],
+        "algo": config["algo"],
+        "dataset": config["dataset"],
+        "train": train,
+        "loader": {**DEFAULT_LOADER_OPTIONS, **(loader_options or {})},
+    }
+
+
+def load_vision_data(reference: dict):
+    """Builds the ``VisionData`` of a reference, its batches are loaded lazily while the checks iterate over them.
+
+    Raises a ``ValueError`` when a loader option set away from its default is not supported by the ``load_dataset`` of
+    the referenced dataset, rather than silently ignoring it.
+    """
+    module = load_module(get_dataset(reference["domain"], reference["algo"], reference["dataset"]))
+    parameters = inspect.signature(module.load_dataset).parameters
+    dropped = sorted(
+        name
+        for name, value in reference["loader"].items()
+        if name not in parameters and value != DEFAULT_LOADER_OPTIONS.get(name)
+    )
+    if dropped:
+        raise ValueError(
+            f"{dropped} are not supported by the {reference['dataset']} dataset."
+            f" Its loader options are {sorted(set(parameters) & set(DEFAULT_LOADER_OPTIONS))}"
+        )
+    options = {name: value for name, value in reference["loader"].items() if name in parameters}
+    if "shuffle" in parameters:
+        options["shuffle"] = False
+    return module.load_dataset(train=reference["train"], object_type="VisionData", **options)
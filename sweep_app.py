@@ -0,0 +1,123 @@
+import os
+import time
+from datetime import datetime
+from typing import Optional
+
+import lightning as L
+from lightning.app.structures import List
+
+from lightning_deepchecks.demo.flows import SUITES, DeepchecksSuites
+from lightning_deepchecks.sweep import plan_batches, save_summary, summarize_sweep, sweep_configs
+
+
+class SweepFlow(L.LightningFlow):
+    """Runs ``suites`` across many datasets in one job, all the registered ones by default.
+
+    The datasets are planned into batches: the light tabular ones are packed together and share at most
+    ``max_light_runners`` runners, each vision dataset is isolated on one of at most ``max_heavy_runners`` runners
+    using the ``heavy_compute`` machine. Within a runner, the suites of a dataset share its data and its model. Once
+    every batch has run, a cross-dataset summary is written to ``summary_dir`` and the app stops.
+    """
+
+    def __init__(
+        self,
+        suites: list = SUITES,
+        dataset_names: Optional[list] = None,
+        batch_capacity: int = 4,
+        max_light_runners: int = 2,
+        max_heavy_runners: int = 1,
+        heavy_compute: str = "gpu",
+        parallel: bool = True,
+        handoff: str = "arrow",
+        check_workers: Optional[int] = None,
+        summary_dir: str = "sweep_results",
+    ):
+        super().__init__()
+        unknown = set(suites) - set(SUITES)
+        if unknown:
+            raise ValueError(f"{sorted(unknown)} are not supported. Supported suites are {SUITES}")
+        self.batches = plan_batches(sweep_configs(suites, dataset_names), batch_capacity)
+        self.pending_batches = list(range(len(self.batches)))
+        self.runner_kwargs = {"parallel": parallel, "handoff": handoff, "check_workers": check_workers}
+        self.max_light_runners = max_light_runners
+        self.max_heavy_runners = max_heavy_runners
+        self.heavy_compute = heavy_compute
+        self.runners = List()
+        # Per runner: whether it is heavy, and the batch and position of the config it runs.
+        self.assignments = []
+        self.started_at = None
+        # Dataset to its status and the report descriptors of its suites.
+        self.results = {}
+        self.summary = []
+        self.summary_dir = summary_dir
+        self.summary_path = None
+        self.has_completed = False
+
+    def run(self):
+        if self.has_completed:
+            return
+        self.started_at = self.started_at or time.time()
+
+        # Step 1: Hand the pending batches to idle runners of their kind, growing each pool up to its limit.
+        for batch in list(self.pending_batches):
+            heavy = self.batches[batch]["heavy"]
+            index = next(
+                (i for i, a in enumerate(self.assignments) if a["heavy"] == heavy and a["batch"] is None),
+                None,
+            )
+            max_runners = self.max_heavy_runners if heavy else self.max_light_runners
+            if index is None and sum(a["heavy"] == heavy for a in self.assignments) < max_runners:
+                compute = self.heavy_compute if heavy else None
+                self.runners.append(DeepchecksSuites(cloud_compute=compute, **self.runner_kwargs))
+                self.assignments = [*self.assignments, {"heavy": heavy, "batch": None, "position": 0}]
+                index = len(self.assignments) - 1
+            if index is not None:
+                print(f"Launching the batch {batch}: {[c['dataset'] for c in self.batches[batch]['configs']]}")
+                self._assign(index, batch=batch, position=0)
+                self.pending_batches = [b for b in self.pending_batches if b != batch]
+
+        # Step 2: Progress every runner through the configs of its batch.
+        for index, runner in enumerate(self.runners):
+            assignment = self.assignments[index]
+            if assignment["batch"] is None:
+                continue
+            config = self.batches[assignment["batch"]]["configs"][assignment["position"]]
+            if runner.run_id is None:
+                runner.reset(f"sweep-{assignment['batch']}-{assignment['position']}")
+            runner.run(config)
+            if not runner.has_completed:
+                continue
+            self.results = {
+                **self.results,
+                config["dataset"]: {
+                    "status": "failed" if runner.failed_suites else "succeeded",
+                    "reports": runner.reports(config["suites"]),
+                },
+            }
+            runner.run_id = None
+            if assignment["position"] + 1 < len(self.batches[assignment["batch"]]["configs"]):
+                self._assign(index, position=assignment["position"] + 1)
+            else:
+                self._assign(index, batch=None, position=0)
+
+        # Step 3: Consolidate the results once every batch has run.
+        if not self.pending_batches and all(a["batch"] is None for a in self.assignments):
+            self._finish()
+
+    def _assign(self, index: int, **fields):
+        self.assignments = [{**a, **fields} if i == index else a for i, a in enumerate(self.assignments)]
+
+    def _finish(self):
+        self.summary = summarize_sweep(self.results)
+        run_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        self.summary_path = save_summary(self.summary, os.path.join(self.summary_dir, f"sweep_{run_time}.jsonl"))
+        failed = [dataset for dataset, result in self.results.items() if result["status"] == "failed"]
+        print(
+            f"Finished the sweep of {len(self.results)} datasets in {time.time() - self.started_at:.0f}s,"
+            f" {len(failed)} failed {failed}. Summary written to {self.summary_path}."
+        )
+        self.has_completed = True
+        self.stop("The sweep has completed.")
+
+
+app = L.LightningApp(SweepFlow())
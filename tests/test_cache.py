@@ -0,0 +1,31 @@
+import os
+
+from lightning_deepchecks.cache import ResultCache
+
+
+def _cached(tmp_path):
+    report_path = tmp_path / "report.html"
+    report_path.write_text("<html></html>")
+    cache = ResultCache(str(tmp_path / "results"))
+    cache.save("key", {"checks": [1, 2, 3]}, str(report_path))
+    return cache
+
+
+def test_result_is_loaded_with_its_report(tmp_path):
+    cache = _cached(tmp_path)
+
+    result, report_path = cache.load("key")
+
+    assert result == {"checks": [1, 2, 3]}
+    assert os.path.isfile(report_path)
+
+
+def test_truncated_result_is_discarded_as_a_miss(tmp_path):
+    cache = _cached(tmp_path)
+    result_path = os.path.join(cache.cache_dir, "key", ResultCache.RESULT_FILE)
+    with open(result_path, "r+b") as f:
+        f.truncate(os.path.getsize(result_path) // 2)
+
+    assert cache.load("key") is None
+    assert not os.path.exists(os.path.join(cache.cache_dir, "key"))
+    assert cache.load("key") is None
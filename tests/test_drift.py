@@ -0,0 +1,32 @@
+import pandas as pd
+
+from lightning_deepchecks.drift import DatasetSketch, DriftMonitor, drift_scores
+
+
+def _frame(cities, ages, labels):
+    return pd.DataFrame({"city": cities, "age": ages, "income": labels})
+
+
+def test_undeclared_string_column_is_sketched_as_categorical():
+    reference = _frame(["paris", "lyon", "paris", "nice"], [25, 40, 33, 51], ["<=50K", ">50K", "<=50K", ">50K"])
+
+    sketch = DatasetSketch.for_reference(reference, "income", cat_features=[])
+
+    assert sketch.features["city"].kind == "categorical"
+    assert sketch.features["income"].kind == "categorical"
+    assert sketch.features["age"].kind == "numeric"
+    assert sketch.features["city"].counts == {"paris": 2, "lyon": 1, "nice": 1}
+
+
+def test_undeclared_string_column_drift_is_scored(tmp_path):
+    reference = _frame(["paris", "lyon", "paris", "nice"], [25, 40, 33, 51], ["<=50K", ">50K", "<=50K", ">50K"])
+    window = _frame(["lille", "lille", "paris", "lille"], [27, 45, 30, 60], ["<=50K", "<=50K", "<=50K", ">50K"])
+
+    monitor = DriftMonitor("reference", str(tmp_path))
+    monitor.set_reference(reference, "income", cat_features=[])
+    scores = monitor.observe(window)
+
+    assert scores["window"]["city"]["method"] == "Cramer's V"
+    assert scores["window"]["city"]["drift_score"] > 0
+    unchanged = drift_scores(monitor.reference, DatasetSketch.for_reference(reference, "income", cat_features=[]))
+    assert unchanged["city"]["drift_score"] == 0